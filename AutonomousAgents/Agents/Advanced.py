@@ -1,26 +1,59 @@
-
+import time
+import logging
 from Utils.Config import *
+from Utils.TaskGraph import buildFusedPrompt, parseFusedPlan, askDependencies, aaskDependencies, dependencyLevels
+from Utils.WorkStealing import WorkStealingScheduler
+from Utils.Messages import Message, DONE, TASK
+from Utils.MessageLog import openRunBus, runKey
+from Utils.SocketBus import connectBus, remoteWorkers
+from Utils.Blackboard import Blackboard
+
+logger = logging.getLogger(__name__)
 
 
 class SubAgent:
-    def __init__(self, task, agentName, messageBus):
+    def __init__(self, task, agentName, messageBus, blackboard=None):
         self.agentTool = AgentTool()
         self.task = task
         self.agentName = agentName
         self.bus = messageBus
+        self.bus.subscribe(agentName)
+        self.blackboard = blackboard or Blackboard()
         self.result = None
         self.state = {}
         self.completed = False
         self.subagentTasks = None
-        self.delegatedTo = None
-
-    def sendMessage(self, to, content):
-        self.bus.send(self.agentName, to, content)
-
-    def receiveMessages(self):
-        return self.bus.receive(self.agentName)
+        self.dependencies = None
+        self.worker = None
+        self.replies = {}
+        self.handlers = {
+            DONE: self.onDone,
+        }
+
+    def sendMessage(self, to, kind, payload=None):
+        message = Message(kind, self.agentName, to, payload)
+        self.bus.send(self.agentName, to, message)
+        return message
+
+    def receiveMessages(self, allowedFrom=None, timeout=0):
+        return self.bus.receive(self.agentName, allowedFrom, timeout)
+
+    def processMessages(self, allowedFrom=None, timeout=0):
+        # Messages are dispatched on their kind with one dictionary lookup
+        for m in self.receiveMessages(allowedFrom, timeout):
+            message = m['content']
+            handler = self.handlers.get(getattr(message, 'kind', None))
+            if handler is None:
+                logger.warning(f"[{self.agentName}] Ignoring message from {m['from']}: {message}")
+                continue
+            handler(message)
+
+    def onDone(self, message):
+        self.replies[message.correlationId] = message.payload
 
     def needsDataFrom(self):
+        if self.dependencies is not None:
+            return list(self.dependencies)
         if not self.subagentTasks or len(self.subagentTasks) <= 1:
             return []
         myTask = self.task
@@ -40,88 +73,118 @@ class SubAgent:
             prompt
         )
         names = [n.strip() for n in answer.split(",") if n.strip() and n.strip().upper() != "NONE"]
-        return names
+        return [n for n in names if n in self.subagentTasks and n != self.agentName]
 
-    def askForHelp(self):
+    def gatherDependencies(self, timeout=None):
+        # Results come straight off the blackboard, waiting only for peers that haven't published yet
         needed = self.needsDataFrom()
-        for agentName in needed:
-            self.sendMessage(agentName, f"Can you help me with your result for {self.subagentTasks[agentName]}?")
-
-    def maybeDelegate(self):
-        # Only allow delegation if there are at least 3 agents (prevents infinite loops on two)
-        if self.subagentTasks and len(self.subagentTasks) > 2 and random.random() < 0.80:
-            others = [name for name in self.subagentTasks if name != self.agentName]
-            if others:
-                chosen = random.choice(others)
-                # Prevent delegating back and forth endlessly
-                if self.delegatedTo == chosen:
-                    return False
-                self.delegatedTo = chosen
-                self.sendMessage(chosen, f"Please do this task for me: {self.task}")
-                self.completed = True
-                self.result = f"Delegated to {chosen}"
-                return True
-        return False
+        self.state.update(self.blackboard.wait(needed, timeout))
+
+    def stepPrompt(self):
+        # The results of the agents this one depends on go into its prompt
+        if not self.state:
+            return self.task
+        results = "\n".join(f"{name} ({entry.get('task')}): {entry.get('result')}" for name, entry in self.state.items())
+        return f"{self.task}\n\nResults of the steps this one depends on:\n{results}"
 
     def runStep(self, verbose=False):
-        if not self.completed and not self.maybeDelegate():
-            clarified = self.agentTool.run(skillInstructions, self.task)
-            if verbose:
-                print(f"\n[{self.agentName}] Clarified action: {clarified}")
-            actions = graph.getActions(clarified)
-            allSkills = graph.getAgentActions()
-            results = graph.executeActions(allSkills, actions)
-            filtered = [str(r) for r in results if r]
-            finalResult = "\n".join(filtered)
-            if verbose:
-                print(f"Executed actions, got:\n{finalResult}")
-            self.result = finalResult or "No action result."
-            self.completed = True
-            self.sendMessage(None, f"Done with: {self.task}")
-
-    def processMessages(self, verbose=False):
-        newMessages = self.receiveMessages()
-        for m in newMessages:
-            if verbose:
-                print(f"\n[{self.agentName}] Message from {m['from']}: {m['content']}")
-            if "Please do this task" in m['content']:
-                task = m['content'].split("Please do this task for me:", 1)[-1].strip()
-                # Prevent circular delegation: If asked to do the task I delegated, just execute.
-                if task == self.task:
-                    clarified = self.agentTool.run(skillInstructions, task)
-                    actions = graph.getActions(clarified)
-                    allSkills = graph.getAgentActions()
-                    results = graph.executeActions(allSkills, actions)
-                    filtered = [str(r) for r in results if r]
-                    finalResult = "\n".join(filtered)
-                    reply = f"Did your delegated task: {task}\nResult: {finalResult or 'No action result.'}"
-                    self.sendMessage(m['from'], reply)
+        if not self.completed:
+            try:
+                self.gatherDependencies()
+                if self.worker:
+                    self.completeRemote(self.dispatch(), verbose)
                 else:
-                    # Actually delegate
-                    clarified = self.agentTool.run(skillInstructions, task)
-                    actions = graph.getActions(clarified)
-                    allSkills = graph.getAgentActions()
-                    results = graph.executeActions(allSkills, actions)
-                    filtered = [str(r) for r in results if r]
-                    finalResult = "\n".join(filtered)
-                    reply = f"Did your delegated task: {task}\nResult: {finalResult or 'No action result.'}"
-                    self.sendMessage(m['from'], reply)
-            elif "Can you help" in m['content']:
-                reply = f"\nSure, {m['from']}! Here's my result for {self.task}: {self.result or 'not ready yet!'}"
-                self.sendMessage(m['from'], reply)
-            elif "Here's" in m['content'] or "Done with" in m['content']:
-                self.state[m['from']] = m['content']
+                    clarified = self.agentTool.run(skillInstructions, self.stepPrompt())
+                    self.completeStep(clarified, verbose)
+            finally:
+                self.failStep()
+
+    async def arunStep(self, verbose=False):
+        if not self.completed:
+            try:
+                await asyncio.to_thread(self.gatherDependencies)
+                if self.worker:
+                    self.completeRemote(await asyncio.to_thread(self.dispatch), verbose)
+                else:
+                    clarified = await self.agentTool.arun(skillInstructions, self.stepPrompt())
+                    await asyncio.to_thread(self.completeStep, clarified, verbose)
+            finally:
+                self.failStep()
+
+    def dispatch(self, timeout=None):
+        """
+        Send the step to its worker process as a TASK, with the results it depends on in the payload,
+        and block on the bus until the worker's DONE for it arrives. Returns the DONE payload.
+        """
+        timeout  = float(os.getenv('BUS_TASK_TIMEOUT', '300')) if timeout is None else timeout
+        task     = self.sendMessage(self.worker, TASK, {"task": self.task, "dependencies": self.state})
+        deadline = time.monotonic() + timeout
+        while task.correlationId not in self.replies and time.monotonic() < deadline:
+            self.processMessages([self.worker], deadline - time.monotonic())
+        if task.correlationId not in self.replies:
+            raise TimeoutError(f"{self.worker} did not finish {self.task} within {timeout:g}s.")
+        return self.replies.pop(task.correlationId)
+
+    def completeRemote(self, payload, verbose=False):
+        # A failed remote step is left to failStep, like a local one
+        if payload.get("failed"):
+            return
+        self.result = payload.get("result")
+        self.completed = True
+        self.blackboard.publish(self.agentName, {"task": self.task, "result": self.result})
+        if verbose:
+            print(f"\n[{self.agentName}] {self.worker} completed: {self.result}")
 
+    def failStep(self):
+        # A step that didn't complete still publishes, so its dependents don't wait out BLACKBOARD_TIMEOUT
+        if not self.completed:
+            self.result = "Step failed."
+            self.blackboard.publish(self.agentName, {"task": self.task, "result": self.result, "failed": True})
+
+    def completeStep(self, clarified, verbose=False):
+        if verbose:
+            print(f"\n[{self.agentName}] Clarified action: {clarified}")
+        self.result = self.executeClarified(clarified, verbose)
+        self.completed = True
+        self.blackboard.publish(self.agentName, {"task": self.task, "result": self.result})
+
+    def executeClarified(self, clarified, verbose=False):
+        actions = graph.getActions(clarified)
+        allSkills = graph.getAgentActions()
+        results = graph.executeActions(allSkills, actions)
+        filtered = [str(r) for r in results if r]
+        finalResult = "\n".join(filtered)
+        if verbose:
+            print(f"Executed actions, got:\n{finalResult}")
+        return finalResult or "No action result."
 
 class OrchestratorAgent:
-    def __init__(self):
+    def __init__(self, maxWorkers=None):
         self.agentTool = AgentTool()
-        self.bus = HoloRelay()
         self.subagents = {}
+        # Agents that finish early steal queued steps from busier agents instead of random delegation
+        self.maxWorkers = maxWorkers or int(os.getenv("MAX_AGENT_WORKERS", "4"))
+        self.schedulerStats = {}
 
     def decomposeSteps(self, userGoal):
+        steps = planCache.get(userGoal, "Advanced")
+        if steps is None:
+            stepsText = self.agentTool.run("You are an expert orchestrator agent.", self.decomposePrompt(userGoal))
+            steps = self.parseSteps(stepsText)
+            planCache.set(userGoal, steps, "Advanced")
+        return steps
+
+    async def adecomposeSteps(self, userGoal):
+        steps = planCache.get(userGoal, "Advanced")
+        if steps is None:
+            stepsText = await self.agentTool.arun("You are an expert orchestrator agent.", self.decomposePrompt(userGoal))
+            steps = self.parseSteps(stepsText)
+            planCache.set(userGoal, steps, "Advanced")
+        return steps
+
+    def decomposePrompt(self, userGoal):
         availableActions = graph.getAgentActions()
-        prompt = (
+        return (
             "Given the following available actions:\n"
             f"{', '.join(availableActions)}\n"
             "If the goal can be answered directly without calling any of these actions, say 'NO ACTIONS NEEDED'.\n"
@@ -132,92 +195,255 @@ class OrchestratorAgent:
             "- get_temperature(47.6588, -117.4260)\n"
             f"Goal: {userGoal}"
         )
-        stepsText = self.agentTool.run("You are an expert orchestrator agent.", prompt)
-        steps = [line.lstrip("-1234567890. ").strip() for line in stepsText.splitlines() if line.strip()]
-        return steps
 
-    def run(self, mainAgent, userGoal, verbose=False):
-        steps = self.decomposeSteps(userGoal)
-        results = []
+    def parseSteps(self, stepsText):
+        return [line.lstrip("-1234567890. ").strip() for line in stepsText.splitlines() if line.strip()]
+
+    def clarifyAndDecompose(self, userGoal):
+        """
+        Clarify the goal and plan it in a single call. Returns (task, steps), or None if the answer could not be parsed.
+        """
+        answer = self.agentTool.run("You are an expert orchestrator agent.", buildFusedPrompt(graph.getAgentActions(), userGoal, stepReferences=False))
+        return parseFusedPlan(answer, planCache, "Advanced")
+
+    async def aclarifyAndDecompose(self, userGoal):
+        answer = await self.agentTool.arun("You are an expert orchestrator agent.", buildFusedPrompt(graph.getAgentActions(), userGoal, stepReferences=False))
+        return parseFusedPlan(answer, planCache, "Advanced")
+
+    def needsDirectAnswer(self, steps):
         stepsClean = [s.lower().strip() for s in steps]
-        if not steps or any("no action" in s for s in stepsClean):
-            if verbose:
-                print(f"\n[{mainAgent}] No sub-agents needed! Answering directly.")
-            answer = self.agentTool.run(
-                "You are a helpful assistant who answers questions directly if no tools/actions are required.",
-                f"Answer this question: \"{userGoal}\""
-            )
-            return [{"step": "direct_answer", "result": answer}]
+        return not steps or any("no action" in s for s in stepsClean)
 
-        self.subagents = {}
+    def directAnswerPrompt(self, userGoal):
+        return (
+            "You are a helpful assistant who answers questions directly if no tools/actions are required.",
+            f"Answer this question: \"{userGoal}\""
+        )
+
+    def createBus(self, steps):
+        # Each run gets its own bus so concurrent runs on one orchestrator never share mailboxes.
+        # With BUS_ADDRESS set the run uses a broker's bus, and with BUS_WORKERS set too every step is sent
+        # to a worker process (python -m Utils.SocketBus <address> --worker <name>) as a TASK and its DONE awaited.
+        # With BUS_LOG_DIR set the bus is logged to disk and an interrupted run of the same plan resumes.
+        logDir = os.getenv('BUS_LOG_DIR')
+        if os.getenv('BUS_ADDRESS') or not logDir:
+            return connectBus()
+        return openRunBus(os.path.join(logDir, runKey(steps)))
+
+    def createSubagents(self, steps):
+        bus = self.createBus(steps)
+        blackboard = Blackboard()
+        workers = remoteWorkers()
+        subagents = {}
         subagentTasks = {}
         for i, step in enumerate(steps, 1):
             subAgentName = SUB_MINIONS[(i - 1) % len(SUB_MINIONS)]
-            self.subagents[subAgentName] = SubAgent(step, subAgentName, messageBus=self.bus)
+            subagents[subAgentName] = SubAgent(step, subAgentName, messageBus=bus, blackboard=blackboard)
             subagentTasks[subAgentName] = step
+            if workers:
+                subagents[subAgentName].worker = workers[(i - 1) % len(workers)]
 
-        for agent in self.subagents.values():
+        for agent in subagents.values():
             agent.subagentTasks = subagentTasks
+        self.subagents = subagents
+        return subagents, bus
+
+    def discoverDependencies(self, subagents):
+        tasks = {name: agent.task for name, agent in subagents.items()}
+        self.applyDependencies(subagents, askDependencies(tasks, self.askDependency))
+
+    async def adiscoverDependencies(self, subagents):
+        tasks = {name: agent.task for name, agent in subagents.items()}
+        self.applyDependencies(subagents, await aaskDependencies(tasks, self.aaskDependency))
+
+    def askDependency(self, prompt):
+        return self.agentTool.run("You are a helpful orchestrator determining agent dependencies.", prompt)
+
+    async def aaskDependency(self, prompt):
+        return await self.agentTool.arun("You are a helpful orchestrator determining agent dependencies.", prompt)
+
+    def applyDependencies(self, subagents, matrix):
+        if matrix is None:
+            if len(subagents) > 1:
+                logger.warning("Could not parse the dependency matrix, agents will ask individually.")
+            return
+        for name, agent in subagents.items():
+            agent.dependencies = matrix[name]
+
+    def createScheduler(self, subagents):
+        """
+        Return the scheduler for the step agents. Its workers are only thread slots named after the
+        first maxWorkers agents, every step still runs on its own agent, so stealing just moves a
+        queued step to an idle thread and doesn't hand one agent's task to another agent.
+        """
+        workers = list(subagents)[:self.maxWorkers]
+        return WorkStealingScheduler(workers)
+
+    def stepLevels(self, subagents):
+        """
+        Return the agents grouped by dependency level, so each level only starts once the results
+        it needs are on the blackboard and no worker sits blocked waiting for a queued step.
+        """
+        dependencies = {name: agent.needsDataFrom() for name, agent in subagents.items()}
+        levels = dependencyLevels(dependencies)
+        for name, agent in subagents.items():
+            agent.dependencies = dependencies[name]
+        return [[subagents[name] for name in level] for level in levels]
+
+    def runSteps(self, subagents, verbose=False):
+        scheduler = self.createScheduler(subagents)
+        for level in self.stepLevels(subagents):
+            scheduler.distribute(level)
+            scheduler.run(lambda agent, worker: agent.runStep(verbose=verbose))
+        self.schedulerStats = scheduler.stats()
+
+    async def arunSteps(self, subagents, verbose=False):
+        scheduler = self.createScheduler(subagents)
+        for level in await asyncio.to_thread(self.stepLevels, subagents):
+            scheduler.distribute(level)
+            await scheduler.arun(lambda agent, worker: agent.arunStep(verbose=verbose))
+        self.schedulerStats = scheduler.stats()
+
+    def resumeAgents(self, subagents, bus):
+        """
+        Restore what an interrupted attempt of this run already produced from the bus log.
+        Agents whose result was logged keep it and are not run again, failed steps run again. From then on every result published to the blackboard is logged as well.
+        """
+        if not hasattr(bus, 'history'):
+            return
+        history = bus.history()
+        for entry in history:
+            message = entry["content"]
+            kind    = getattr(message, 'kind', None)
+            sender  = subagents.get(entry["from"])
+            if kind == DONE and sender is not None and message.payload.get("task") == sender.task and not sender.completed and not message.payload.get("failed"):
+                sender.result    = message.payload.get("result")
+                sender.completed = True
+                sender.blackboard.publish(sender.agentName, message.payload)
+        if history:
+            restored = sum(agent.completed for agent in subagents.values())
+            logger.info(f"Resumed run: {restored}/{len(subagents)} steps restored.")
+        # Blackboard results never travel over the bus, so they are written to its log directly
+        blackboards = {id(agent.blackboard): agent.blackboard for agent in subagents.values()}
+        for blackboard in blackboards.values():
+            blackboard.subscribe(lambda key, value, version: bus.record(key, Message(DONE, key, None, value)))
+
+    def collectResults(self, subagents):
+        results = []
+        for agent in subagents.values():
+            results.append({"step": agent.task, "result": agent.result})
+        return results
+
+    def run(self, mainAgent, userGoal, verbose=False, steps=None):
+        if steps is None:
+            steps = self.decomposeSteps(userGoal)
+        if self.needsDirectAnswer(steps):
+            if verbose:
+                print(f"\n[{mainAgent}] No sub-agents needed! Answering directly.")
+            answer = self.agentTool.run(*self.directAnswerPrompt(userGoal))
+            return [{"step": "direct_answer", "result": answer}]
+
+        subagents, bus = self.createSubagents(steps)
+        self.resumeAgents(subagents, bus)
 
         if verbose:
             print(f"\n[{mainAgent}] === Calling sub-agents ===")
 
-        for roundNum in range(ROUNDS):
-            for agent in self.subagents.values():
-                agent.processMessages(verbose=verbose)
-            if roundNum == 0:
-                for agent in self.subagents.values():
-                    agent.runStep(verbose=verbose)
-            if roundNum == 1:
-                for agent in self.subagents.values():
-                    agent.askForHelp()
-            if roundNum >= 2:
-                anyMessages = any(agent.receiveMessages() for agent in self.subagents.values())
-                if not anyMessages and all(m.completed for m in self.subagents.values()):
-                    break
-
-        for agent in self.subagents.values():
-            agent.processMessages(verbose=verbose)
-            # Only set results to actual output, not delegated message
-            agentResult = agent.result
-            if agentResult and agentResult.startswith("Delegated to "):
-                # Try to resolve the actual result from agent.state
-                for val in agent.state.values():
-                    if "Result:" in val:
-                        agentResult = val.split("Result:")[-1].strip()
-            results.append({"step": agent.task, "result": agentResult})
+        # Close the bus even if the run fails, so its log stays resumable and the run directory is released
+        finished = False
+        try:
+            self.discoverDependencies(subagents)
+            self.runSteps(subagents, verbose)
+            finished = True
+        finally:
+            bus.close(finished=finished)
+
+        return self.collectResults(subagents)
+
+    async def arun(self, mainAgent, userGoal, verbose=False, steps=None):
+        if steps is None:
+            steps = await self.adecomposeSteps(userGoal)
+        if self.needsDirectAnswer(steps):
+            if verbose:
+                print(f"\n[{mainAgent}] No sub-agents needed! Answering directly.")
+            answer = await self.agentTool.arun(*self.directAnswerPrompt(userGoal))
+            return [{"step": "direct_answer", "result": answer}]
 
-        return results
+        subagents, bus = self.createSubagents(steps)
+        self.resumeAgents(subagents, bus)
+
+        if verbose:
+            print(f"\n[{mainAgent}] === Calling sub-agents ===")
+
+        finished = False
+        try:
+            await self.adiscoverDependencies(subagents)
+            await self.arunSteps(subagents, verbose)
+            finished = True
+        finally:
+            bus.close(finished=finished)
+
+        return self.collectResults(subagents)
 
 
 class MainAgent:
     def __init__(self):
         self.orchestrator = OrchestratorAgent()
         self.agentTool = AgentTool()
+        self.fusedPlanning = os.getenv("FUSED_PLANNING", "False") == "True"
 
-    def processInput(self, userGoal, verbose=False):
-        def llm(prompt):
-            return self.agentTool.run("You are a helpful assistant.", prompt)
-        if verbose:
-            print("\nProcessing user input...\n")
-        prompt = (
+    def clarifyPrompt(self, userGoal):
+        return (
             "You are a helpful assistant. Restate the following user goal as a single clear task.\n"
             f"User Goal: {userGoal}"
         )
-        clarifiedGoal = llm(prompt)
-        mainAgent = MAIN_MINIONS[random.randint(0, len(MAIN_MINIONS) - 1)]
-        if verbose:
-            print(f"[{mainAgent}]: {clarifiedGoal}")
-        results = self.orchestrator.run(mainAgent, clarifiedGoal, verbose=verbose)
+
+    def answerPrompt(self, userGoal, results):
         resultsSummary = "\n".join(
             f"{r['step']}: {r['result']}" for r in results
         )
-        answer = llm(
+        return (
             f"You are a helpful assistant. Answer the user clearly and professionally.\n"
             f"User originally asked: \"{userGoal}\"\n"
             f"Here are the results for that request:\n{resultsSummary}\n"
             "Write your response now."
         )
+
+    def processInput(self, userGoal, verbose=False):
+        def llm(prompt):
+            return self.agentTool.run("You are a helpful assistant.", prompt)
+        if verbose:
+            print("\nProcessing user input...\n")
+        # Fused mode clarifies and plans in one call, falling back to the two-call path if it can't be parsed
+        fused = self.orchestrator.clarifyAndDecompose(userGoal) if self.fusedPlanning else None
+        if fused is not None:
+            clarifiedGoal, steps = fused
+        else:
+            clarifiedGoal, steps = llm(self.clarifyPrompt(userGoal)), None
+        mainAgent = MAIN_MINIONS[random.randint(0, len(MAIN_MINIONS) - 1)]
+        if verbose:
+            print(f"[{mainAgent}]: {clarifiedGoal}")
+        results = self.orchestrator.run(mainAgent, clarifiedGoal, verbose=verbose, steps=steps)
+        # Single-step and direct answers are already user-ready, only aggregates need the summarization call
+        answer = resultFormatter.format(results) or llm(self.answerPrompt(userGoal, results))
+        print(f"\n[{mainAgent}]\n{answer}")
+        return f"[{mainAgent}] {answer}\n"
+
+    async def aprocessInput(self, userGoal, verbose=False):
+        async def llm(prompt):
+            return await self.agentTool.arun("You are a helpful assistant.", prompt)
+        if verbose:
+            print("\nProcessing user input...\n")
+        fused = await self.orchestrator.aclarifyAndDecompose(userGoal) if self.fusedPlanning else None
+        if fused is not None:
+            clarifiedGoal, steps = fused
+        else:
+            clarifiedGoal, steps = await llm(self.clarifyPrompt(userGoal)), None
+        mainAgent = MAIN_MINIONS[random.randint(0, len(MAIN_MINIONS) - 1)]
+        if verbose:
+            print(f"[{mainAgent}]: {clarifiedGoal}")
+        results = await self.orchestrator.arun(mainAgent, clarifiedGoal, verbose=verbose, steps=steps)
+        answer = resultFormatter.format(results) or await llm(self.answerPrompt(userGoal, results))
         print(f"\n[{mainAgent}]\n{answer}")
         return f"[{mainAgent}] {answer}\n"
 
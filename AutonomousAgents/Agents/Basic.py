@@ -1,5 +1,5 @@
-
 from Utils.Config import *
+from Utils.TaskGraph import TaskGraph, buildFusedPrompt, parseFusedPlan
 
 class SubAgent:
     def __init__(self, task, agentName):
@@ -9,6 +9,13 @@ class SubAgent:
 
     def run(self, verbose=False):
         clarified = self.agentTool.run(skillInstructions, self.task)
+        return self.executeClarified(clarified, verbose)
+
+    async def arun(self, verbose=False):
+        clarified = await self.agentTool.arun(skillInstructions, self.task)
+        return await asyncio.to_thread(self.executeClarified, clarified, verbose)
+
+    def executeClarified(self, clarified, verbose=False):
         if verbose:
             print(f"[{self.agentName}] Clarified action: {clarified}")
         actions = graph.getActions(clarified)
@@ -21,75 +28,166 @@ class SubAgent:
         return finalResult or "No action result."
 
 class OrchestratorAgent:
-    def __init__(self):
-        self.agentTool = AgentTool()
+    def __init__(self, parallel=None, maxWorkers=None):
+        self.agentTool  = AgentTool()
+        # Run sub-agents concurrently so a plan costs roughly its slowest step instead of the sum
+        self.parallel   = parallel if parallel is not None else os.getenv("PARALLEL_AGENTS", "True") == "True"
+        self.maxWorkers = maxWorkers or int(os.getenv("MAX_PARALLEL_AGENTS", "4"))
 
     def decomposeSteps(self, userGoal):
+        steps = planCache.get(userGoal, "Basic")
+        if steps is None:
+            stepsText = self.agentTool.run("You are an expert orchestrator assistant.", self.decomposePrompt(userGoal))
+            steps = self.parseSteps(stepsText)
+            planCache.set(userGoal, steps, "Basic")
+        return steps
+
+    async def adecomposeSteps(self, userGoal):
+        steps = planCache.get(userGoal, "Basic")
+        if steps is None:
+            stepsText = await self.agentTool.arun("You are an expert orchestrator assistant.", self.decomposePrompt(userGoal))
+            steps = self.parseSteps(stepsText)
+            planCache.set(userGoal, steps, "Basic")
+        return steps
+
+    def decomposePrompt(self, userGoal):
         availableActions = graph.getAgentActions()
-        prompt = (
+        return (
             "Given the following available actions:\n"
             f"{', '.join(availableActions)}\n"
             "If the goal can be answered directly without calling any of these actions, say 'NO ACTIONS NEEDED'.\n"
             "Otherwise, break down the goal into the MINIMUM number of direct function calls, each matching exactly one of the available actions. "
             "If an action can't be matched directly, SKIP that step. "
             "Do NOT include high-level or abstract instructions. "
+            "If a call needs the result of an earlier call, write {step N} in its place, where N is the position of that earlier call in your list. "
             "Just output a bullet list, one per function call, e.g.:\n"
             "- get_temperature(47.6588, -117.4260)\n"
             f"Goal: {userGoal}"
         )
-        stepsText = self.agentTool.run("You are an expert orchestrator assistant.", prompt)
-        steps = [line.lstrip("-1234567890. ").strip() for line in stepsText.splitlines() if line.strip()]
-        return steps
 
-    def run(self, mainAgent, userGoal, verbose=False):
-        steps = self.decomposeSteps(userGoal)
-        results = []
+    def parseSteps(self, stepsText):
+        return [line.lstrip("-1234567890. ").strip() for line in stepsText.splitlines() if line.strip()]
+
+    def clarifyAndDecompose(self, userGoal):
+        """
+        Clarify the goal and plan it in a single call. Returns (task, steps), or None if the answer could not be parsed.
+        """
+        answer = self.agentTool.run("You are an expert orchestrator assistant.", buildFusedPrompt(graph.getAgentActions(), userGoal))
+        return parseFusedPlan(answer, planCache, "Basic")
+
+    async def aclarifyAndDecompose(self, userGoal):
+        answer = await self.agentTool.arun("You are an expert orchestrator assistant.", buildFusedPrompt(graph.getAgentActions(), userGoal))
+        return parseFusedPlan(answer, planCache, "Basic")
+
+    def needsDirectAnswer(self, steps):
         stepsClean = [s.lower().strip() for s in steps]
-        if not steps or any("no action" in s for s in stepsClean):
+        return not steps or any("no action" in s for s in stepsClean)
+
+    def directAnswerPrompt(self, userGoal):
+        return (
+            "You are a helpful assistant who answers questions directly if no tools/actions are required.",
+            f"Answer this question: \"{userGoal}\""
+        )
+
+    def subAgentName(self, index):
+        return SUB_MINIONS[index % len(SUB_MINIONS)]
+
+    def workers(self, steps):
+        return min(self.maxWorkers, len(steps)) if self.parallel else 1
+
+    def run(self, mainAgent, userGoal, verbose=False, steps=None):
+        if steps is None:
+            steps = self.decomposeSteps(userGoal)
+        if self.needsDirectAnswer(steps):
             if verbose:
                 print(f"\n[{mainAgent}] No sub-agents needed! Answering directly.")
-            answer = self.agentTool.run(
-                "You are a helpful assistant who answers questions directly if no tools/actions are required.",
-                f"Answer this question: \"{userGoal}\""
-            )
+            answer = self.agentTool.run(*self.directAnswerPrompt(userGoal))
             return [{"step": "direct_answer", "result": answer}]
-        for i, step in enumerate(steps, 1):
-            subAgentName = SUB_MINIONS[(i - 1) % len(SUB_MINIONS)]
+
+        def execute(index, task):
+            subAgentName = self.subAgentName(index)
             if verbose:
-                print(f"\n[{mainAgent}] Executing sub-agent\n[{subAgentName}] for task: {step}")
-            subAgent = SubAgent(step, subAgentName)
-            result = subAgent.run(verbose=verbose)
-            results.append({"step": step, "result": result})
-        return results
+                print(f"\n[{mainAgent}] Executing sub-agent\n[{subAgentName}] for task: {task}")
+            return SubAgent(task, subAgentName).run(verbose=verbose)
+
+        # Independent steps run together, chained steps wait for the outputs they reference
+        return TaskGraph(steps).run(execute, maxWorkers=self.workers(steps))
+
+    async def arun(self, mainAgent, userGoal, verbose=False, steps=None):
+        if steps is None:
+            steps = await self.adecomposeSteps(userGoal)
+        if self.needsDirectAnswer(steps):
+            if verbose:
+                print(f"\n[{mainAgent}] No sub-agents needed! Answering directly.")
+            answer = await self.agentTool.arun(*self.directAnswerPrompt(userGoal))
+            return [{"step": "direct_answer", "result": answer}]
+
+        async def execute(index, task):
+            subAgentName = self.subAgentName(index)
+            if verbose:
+                print(f"\n[{mainAgent}] Executing sub-agent\n[{subAgentName}] for task: {task}")
+            return await SubAgent(task, subAgentName).arun(verbose=verbose)
+
+        return await TaskGraph(steps).arun(execute, maxWorkers=self.workers(steps))
 
 class MainAgent:
     def __init__(self):
-        self.orchestrator = OrchestratorAgent()
-        self.agentTool    = AgentTool()
+        self.orchestrator  = OrchestratorAgent()
+        self.agentTool     = AgentTool()
+        self.fusedPlanning = os.getenv("FUSED_PLANNING", "False") == "True"
 
-    def processInput(self, userGoal, verbose=False):
-        def llm(prompt):
-            return self.agentTool.run("You are a helpful assistant.", prompt)
-        if verbose:
-            print(f"\nProcessing request...\n")
-        prompt = (
+    def clarifyPrompt(self, userGoal):
+        return (
             "You are a helpful assistant. Restate the following user goal as a single clear task.\n"
             f"User Goal: {userGoal}"
         )
-        clarifiedGoal = llm(prompt)
-        mainAgent = MAIN_MINIONS[random.randint(0, len(MAIN_MINIONS) - 1)]
-        if verbose:
-            print(f"[{mainAgent}]: {clarifiedGoal}")
-        results = self.orchestrator.run(mainAgent, clarifiedGoal, verbose=verbose)
+
+    def answerPrompt(self, userGoal, results):
         resultsSummary = "\n".join(
             f"{r['step']}: {r['result']}" for r in results
         )
-        answer = llm(
+        return (
             f"You are a helpful assistant. Please answer the user clearly and professionally.\n"
             f"User originally asked: \"{userGoal}\"\n"
             f"Here are the results for that request:\n{resultsSummary}\n"
             "Write your response now."
         )
+
+    def processInput(self, userGoal, verbose=False):
+        def llm(prompt):
+            return self.agentTool.run("You are a helpful assistant.", prompt)
+        if verbose:
+            print(f"\nProcessing request...\n")
+        # Fused mode clarifies and plans in one call, falling back to the two-call path if it can't be parsed
+        fused = self.orchestrator.clarifyAndDecompose(userGoal) if self.fusedPlanning else None
+        if fused is not None:
+            clarifiedGoal, steps = fused
+        else:
+            clarifiedGoal, steps = llm(self.clarifyPrompt(userGoal)), None
+        mainAgent = MAIN_MINIONS[random.randint(0, len(MAIN_MINIONS) - 1)]
+        if verbose:
+            print(f"[{mainAgent}]: {clarifiedGoal}")
+        results = self.orchestrator.run(mainAgent, clarifiedGoal, verbose=verbose, steps=steps)
+        # Single-step and direct answers are already user-ready, only aggregates need the summarization call
+        answer = resultFormatter.format(results) or llm(self.answerPrompt(userGoal, results))
+        print(f"\n[{mainAgent}]\n{answer}")
+        return f"[{mainAgent}] {answer}\n"
+
+    async def aprocessInput(self, userGoal, verbose=False):
+        async def llm(prompt):
+            return await self.agentTool.arun("You are a helpful assistant.", prompt)
+        if verbose:
+            print(f"\nProcessing request...\n")
+        fused = await self.orchestrator.aclarifyAndDecompose(userGoal) if self.fusedPlanning else None
+        if fused is not None:
+            clarifiedGoal, steps = fused
+        else:
+            clarifiedGoal, steps = await llm(self.clarifyPrompt(userGoal)), None
+        mainAgent = MAIN_MINIONS[random.randint(0, len(MAIN_MINIONS) - 1)]
+        if verbose:
+            print(f"[{mainAgent}]: {clarifiedGoal}")
+        results = await self.orchestrator.arun(mainAgent, clarifiedGoal, verbose=verbose, steps=steps)
+        answer = resultFormatter.format(results) or await llm(self.answerPrompt(userGoal, results))
         print(f"\n[{mainAgent}]\n{answer}")
         return f"[{mainAgent}] {answer}\n"
 
@@ -36,11 +36,20 @@ class MainAgent:
 
     def processInput(self, userGoal, verbose=False):
         mainAgent = AGENT_NAME # = MAIN_MINIONS[random.randint(0, len(MAIN_MINIONS) - 1)]
+        answer = self.holoAI.HoloAgent(**self.buildRequest(mainAgent, userGoal))
+        return self.finishTurn(mainAgent, userGoal, answer)
+
+    async def aprocessInput(self, userGoal, verbose=False):
+        mainAgent = AGENT_NAME
+        answer = await self.agentTool.acall(self.holoAI.HoloAgent, **self.buildRequest(mainAgent, userGoal))
+        return self.finishTurn(mainAgent, userGoal, answer)
+
+    def buildRequest(self, mainAgent, userGoal):
         system, instructions = self.configSystem(mainAgent)
         msgs = self.holoAI.formatConversation(self.memories, userGoal)
         skills = graph.getAgentSkills()
         actions = graph.getAgentActions()
-        answer = self.holoAI.HoloAgent(
+        return dict(
             model=self.modelMap[self.provider],
             system=system,
             instructions=instructions,
@@ -48,6 +57,8 @@ class MainAgent:
             skills=skills, 
             actions=actions
         )
+
+    def finishTurn(self, mainAgent, userGoal, answer):
         if answer:
             self.addMemory(userGoal, answer)
         print(f"\n[{mainAgent}]\n{answer}")
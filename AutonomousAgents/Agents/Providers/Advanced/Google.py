@@ -1,34 +1,29 @@
 import os
 import json
-import random
+import logging
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
 
 from Utils.SkillGraph import SkillGraph
-from HoloAI import HoloRelay
+from Utils.PlanCache import PlanCache
+from Utils.ResultFormatter import ResultFormatter
+from Utils.WorkStealing import WorkStealingScheduler
+from Utils.SocketBus import connectBus
+from Utils.Blackboard import Blackboard
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 apiKey    = os.getenv("GEMINI_API_KEY")
 genClient = genai.Client(api_key=apiKey)
 
 # Load typed tools + callable function registry once, reuse everywhere
 skillGraph = SkillGraph()
 tools, toolFunctions = skillGraph.getTypedTools()
-
-ROUNDS = 10
-
-
-class AgentMessageBus:
-    def __init__(self):
-        self.ata = HoloRelay()
-
-    def send(self, fromAgent, toAgent, content):
-        self.ata.send(fromAgent, toAgent, content)
-
-    def receive(self, agentName, allowedFrom=None):
-        return self.ata.receive(agentName, allowedFrom)
+planCache = PlanCache()
+resultFormatter = ResultFormatter()
 
 
 class LlmTool:
@@ -54,99 +49,27 @@ def makeResponsePayload(funcName, result):
 
 
 class SubAgent:
-    def __init__(self, step, agentName, bus, subagentTasks=None):
+    def __init__(self, step, agentName, bus, blackboard=None):
         self.step           = step
         self.agentName      = agentName
         self.bus            = bus
+        self.bus.subscribe(agentName)
+        self.blackboard     = blackboard or Blackboard()
         self.toolFunctions  = toolFunctions   # shared registry
-        self.agentTool      = LlmTool()
         self.result         = None
-        self.state          = {}
         self.completed      = False
-        self.subagentTasks  = subagentTasks or {}
-
-    def sendMessage(self, to, content):
-        self.bus.send(self.agentName, to, content)
-
-    def receiveMessages(self):
-        return self.bus.receive(self.agentName)
-
-    def needsDataFrom(self):
-        if not self.subagentTasks or len(self.subagentTasks) <= 1:
-            return []
-        myTask = self.step
-        otherTasks = [
-            f"{name}: {task['tool']}" for name, task in self.subagentTasks.items() if name != self.agentName
-        ]
-        prompt = (
-            f"Your current task is:\n{myTask}\n"
-            f"Here are the tasks of your fellow agents:\n" +
-            "\n".join(otherTasks) +
-            "\n\nList the NAMES of any agents whose task you need to see before completing your own. "
-            "Only respond with a comma-separated list of agent names. If none, respond with NONE."
-        )
-        answer = self.agentTool.run(
-            "You are a helpful agent determining your dependencies.\n\n" + prompt
-        )
-        names = [n.strip() for n in answer.split(",") if n.strip() and n.strip().upper() != "NONE"]
-        return names
-
-    def askForHelp(self):
-        needed = self.needsDataFrom()
-        for agentName in needed:
-            self.sendMessage(agentName, f"Can you help me with your result for {self.subagentTasks[agentName]['tool']}?")
-
-    def maybeDelegate(self):
-        if self.subagentTasks and len(self.subagentTasks) > 1 and random.random() < 0.8:
-            others = [name for name in self.subagentTasks if name != self.agentName]
-            if others:
-                chosen = random.choice(others)
-                self.sendMessage(chosen, f"Please do this task for me: {self.step}")
-                self.completed = True
-                self.result    = f"Delegated to {chosen}"
-                return True
-        return False
 
     def runStep(self, verbose=False):
-        if not self.completed and not self.maybeDelegate():
+        if not self.completed:
             toolName = self.step['tool']
             args     = self.step.get('args', {})
             # Execute directly via SkillGraph registry
             self.result    = skillGraph.executeTool(toolName, self.toolFunctions, args)
             self.completed = True
-            self.sendMessage(None, f"Done with: {toolName}({args})")
+            self.blackboard.publish(self.agentName, {"step": self.step, "result": self.result})
             if verbose:
                 print(f"\n[{self.agentName}] Completed: {toolName}({args}) = {self.result}")
 
-    def processMessages(self, verbose=False):
-        newMessages = self.receiveMessages()
-        for m in newMessages:
-            if verbose:
-                print(f"\n[{self.agentName}] Message from {m['from']}: {m['content']}")
-            if "Please do this task" in m['content']:
-                import ast
-                try:
-                    delegatedStep = ast.literal_eval(m['content'].split("Please do this task for me:", 1)[-1].strip())
-                    self.step     = delegatedStep
-                    toolName      = delegatedStep['tool']
-                    args          = delegatedStep.get('args', {})
-                    self.result   = skillGraph.executeTool(toolName, self.toolFunctions, args)
-                    self.completed = True
-                    reply = f"Did your delegated task: {delegatedStep}\nResult: {self.result}"
-                except Exception as e:
-                    reply = f"Error running delegated task: {e}"
-                    self.result = reply
-                    self.completed = True
-                self.sendMessage(m['from'], reply)
-            elif "Can you help" in m['content']:
-                reply = f"Sure, {m['from']}! Here's my result for {self.step['tool']}: {self.result or 'not ready yet!'}"
-                self.sendMessage(m['from'], reply)
-            elif "Here's" in m['content']:
-                self.state[m['from']] = m['content']
-            elif "Done with" in m['content']:
-                self.state[m['from']] = m['content']
-
-
 def runStepText(prompt):
     llm = LlmTool()
     return llm.run(prompt)
@@ -154,10 +77,14 @@ def runStepText(prompt):
 
 class OrchestratorAgent:
     def __init__(self):
-        self.toolFunctions = toolFunctions   # shared registry
-        self.bus           = HoloRelay()
+        self.toolFunctions  = toolFunctions   # shared registry
+        self.maxWorkers     = int(os.getenv("MAX_AGENT_WORKERS", "4"))
+        self.schedulerStats = {}
 
     def decomposeSteps(self, userGoal):
+        plan = planCache.get(userGoal, "Advanced.Google")
+        if plan is not None:
+            return plan
         # For planning, expose concise tool info based on callable registry (docstrings)
         toolList = [
             {"name": name, "signature": (f.__doc__ or "")}
@@ -177,38 +104,38 @@ class OrchestratorAgent:
         except Exception:
             print("Failed to parse plan:", planJson)
             raise
+        planCache.set(userGoal, plan, "Advanced.Google")
         return plan
 
+    def runSteps(self, subagents, verbose=False):
+        # Idle agents steal queued steps from busier ones instead of random delegation
+        scheduler = WorkStealingScheduler([agent.agentName for agent in subagents[:self.maxWorkers]])
+        scheduler.distribute(subagents)
+        scheduler.run(lambda agent, worker: agent.runStep(verbose=verbose))
+        self.schedulerStats = scheduler.stats()
+
     def run(self, userGoal, verbose=False):
         steps = self.decomposeSteps(userGoal)
-        subagentTasks = {f"SubAgent-{i+1}": step for i, step in enumerate(steps)}
+        # Each run gets its own bus so concurrent runs never share mailboxes, a broker's when BUS_ADDRESS is set
+        bus = connectBus()
+        blackboard = Blackboard()
         subagents = []
         for i, step in enumerate(steps, 1):
             agentName = f"SubAgent-{i}"
-            subagent  = SubAgent(step, agentName, self.bus, subagentTasks)
+            subagent  = SubAgent(step, agentName, bus, blackboard)
             subagents.append(subagent)
 
-        for roundNum in range(ROUNDS):
-            for agent in subagents:
-                agent.processMessages(verbose=verbose)
-            if roundNum == 0:
-                for agent in subagents:
-                    agent.runStep(verbose=verbose)
-            if roundNum == 1:
-                for agent in subagents:
-                    agent.askForHelp()
-            if roundNum >= 2:
-                anyMessages = any(agent.receiveMessages() for agent in subagents)
-                if not anyMessages and all(a.completed for a in subagents):
-                    break
+        # Steps are direct tool calls with fixed args, so no step can use another's result and
+        # there are no dependencies to discover or wait for
+        self.runSteps(subagents, verbose)
 
         results = []
         for agent in subagents:
-            agent.processMessages(verbose=verbose)
             results.append({
                 "step": f"{agent.step['tool']}({agent.step.get('args', {})})",
                 "result": agent.result
             })
+        bus.close()
         return results
 
 
@@ -233,7 +160,7 @@ class MainAgent:
             f"{resultsSummary}\n"
             "Write a clear, natural language answer for the user that references the original request directly."
         )
-        answer = runStepText(prompt)
+        answer = resultFormatter.format(results) or runStepText(prompt)
         if verbose:
             print(f"\n[Final Response]:\n{answer}\n")
         else:
@@ -1,32 +1,29 @@
 import os
 import json
-import random
+import logging
 from dotenv import load_dotenv
 from openai import OpenAI
 
 from Utils.SkillGraph import SkillGraph
-from HoloAI import HoloRelay
+from Utils.PlanCache import PlanCache
+from Utils.ResultFormatter import ResultFormatter
+from Utils.TaskGraph import askDependencies, dependencyLevels
+from Utils.WorkStealing import WorkStealingScheduler
+from Utils.SocketBus import connectBus
+from Utils.Blackboard import Blackboard
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 gptClient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 SCHEMA_TYPE = "chat_completions"
-ROUNDS = 10
 
 # Load both tool schemas and functions
 skillGraph = SkillGraph()
 tools, toolFunctions = skillGraph.getJsonTools(SCHEMA_TYPE)
-
-
-class AgentMessageBus:
-    def __init__(self):
-        self.ata = HoloRelay()
-
-    def send(self, fromAgent, toAgent, content):
-        self.ata.send(fromAgent, toAgent, content)
-
-    def receive(self, agentName, allowedFrom=None):
-        return self.ata.receive(agentName, allowedFrom)
+planCache = PlanCache()
+resultFormatter = ResultFormatter()
 
 
 class LlmTool:
@@ -58,24 +55,23 @@ class LlmTool:
 
 
 class SubAgent:
-    def __init__(self, step, agentName, bus, subagentTasks=None):
+    def __init__(self, step, agentName, bus, subagentTasks=None, blackboard=None):
         self.step          = step
         self.agentName     = agentName
         self.bus           = bus
+        self.bus.subscribe(agentName)
+        self.blackboard    = blackboard or Blackboard()
         self.toolFunctions = toolFunctions
         self.schemas       = tools
         self.result        = None
         self.completed     = False
         self.state         = {}
         self.subagentTasks = subagentTasks or {}
-
-    def sendMessage(self, to, content):
-        self.bus.send(self.agentName, to, content)
-
-    def receiveMessages(self):
-        return self.bus.receive(self.agentName)
+        self.dependencies  = None
 
     def needsDataFrom(self):
+        if self.dependencies is not None:
+            return list(self.dependencies)
         if not self.subagentTasks or len(self.subagentTasks) <= 1:
             return []
         myTask = self.step
@@ -92,30 +88,41 @@ class SubAgent:
         )
         answer = llm.run(prompt)
         names  = [n.strip() for n in answer.split(",") if n.strip() and n.strip().upper() != "NONE"]
-        return names
+        return [n for n in names if n in self.subagentTasks and n != self.agentName]
 
-    def askForHelp(self):
+    def gatherDependencies(self, timeout=None):
+        # Results come straight off the blackboard, waiting only for peers that haven't published yet
         needed = self.needsDataFrom()
-        for agentName in needed:
-            self.sendMessage(agentName, f"Can you help me with your result for {self.subagentTasks[agentName]['tool']}?")
-
-    def maybeDelegate(self):
-        if self.subagentTasks and len(self.subagentTasks) > 1 and random.random() < 0.5:
-            others = [name for name in self.subagentTasks if name != self.agentName]
-            if others:
-                chosen = random.choice(others)
-                self.sendMessage(chosen, f"Please do this task for me: {self.step}")
-                self.completed = True
-                self.result = f"Delegated to {chosen}"
-                return True
-        return False
+        self.state.update(self.blackboard.wait(needed, timeout))
+
+    def stepPrompt(self):
+        # The results of the agents this one depends on go into its prompt
+        if not self.state:
+            return f"Step: {self.step}"
+        results = "\n".join(f"{name} ({entry.get('step')}): {entry.get('result')}" for name, entry in self.state.items())
+        return f"Step: {self.step}\n\nResults of the steps this one depends on:\n{results}"
+
+    def failStep(self):
+        # A step that didn't complete still publishes, so its dependents don't wait out BLACKBOARD_TIMEOUT
+        if not self.completed:
+            self.result = "Step failed."
+            self.blackboard.publish(self.agentName, {"step": self.step, "result": self.result, "failed": True})
 
     def runStep(self, verbose=False):
-        if not self.completed and not self.maybeDelegate():
+        if self.completed:
+            return
+        try:
+            self.gatherDependencies()
+            self.executeStep(verbose)
+        finally:
+            self.failStep()
+
+    def executeStep(self, verbose=False):
+        if not self.completed:
             llm = LlmTool()
             messages = [
                 skillGraph.handleJsonFormat("system", "You are a sub-agent. Complete the assigned step using ONLY the available tools."),
-                skillGraph.handleJsonFormat("user", f"Step: {self.step}")
+                skillGraph.handleJsonFormat("user", self.stepPrompt())
             ]
             while True:
                 msg = llm.runFunction(messages, self.schemas)
@@ -136,38 +143,10 @@ class SubAgent:
                     self.result = msg.content
                     break
             self.completed = True
-            self.sendMessage(None, f"Done with: {self.step}")
+            self.blackboard.publish(self.agentName, {"step": self.step, "result": self.result})
             if verbose:
                 print(f"\n[{self.agentName}] Completed: {self.step} = {self.result}")
 
-    def processMessages(self, verbose=False):
-        newMessages = self.receiveMessages()
-        for m in newMessages:
-            if verbose:
-                print(f"\n[{self.agentName}] Message from {m['from']}: {m['content']}")
-            if "Please do this task" in m['content']:
-                import ast
-                try:
-                    delegatedStep = ast.literal_eval(m['content'].split("Please do this task for me:", 1)[-1].strip())
-                    toolName = delegatedStep['tool']
-                    args = delegatedStep.get('args', {})
-                    self.result = skillGraph.executeTool(toolName, self.toolFunctions, args)
-                    self.completed = True
-                    reply = f"Did your delegated task: {delegatedStep}\nResult: {self.result}"
-                except Exception as e:
-                    reply = f"Error running delegated task: {e}"
-                    self.result = reply
-                    self.completed = True
-                self.sendMessage(m['from'], reply)
-            elif "Can you help" in m['content']:
-                reply = f"Sure, {m['from']}! Here's my result for {self.step['tool']}: {self.result or 'not ready yet!'}"
-                self.sendMessage(m['from'], reply)
-            elif "Here's" in m['content']:
-                self.state[m['from']] = m['content']
-            elif "Done with" in m['content']:
-                self.state[m['from']] = m['content']
-
-
 def runStepText(prompt):
     llm = LlmTool()
     return llm.run(prompt)
@@ -175,11 +154,15 @@ def runStepText(prompt):
 
 class OrchestratorAgent:
     def __init__(self):
-        self.toolFunctions = toolFunctions
-        self.toolSchemas   = tools
-        self.bus           = HoloRelay()
+        self.toolFunctions  = toolFunctions
+        self.toolSchemas    = tools
+        self.maxWorkers     = int(os.getenv("MAX_AGENT_WORKERS", "4"))
+        self.schedulerStats = {}
 
     def decomposeSteps(self, userGoal):
+        plan = planCache.get(userGoal, "Advanced.OpenAI_C")
+        if plan is not None:
+            return plan
         toolList = [
             {
                 "name": schema["function"]["name"],
@@ -204,38 +187,56 @@ class OrchestratorAgent:
         except Exception:
             print("Failed to parse plan:", planJson)
             raise
+        planCache.set(userGoal, plan, "Advanced.OpenAI_C")
         return plan
 
+    def discoverDependencies(self, subagents):
+        tasks  = {agent.agentName: f"{agent.step['tool']}({agent.step.get('args', {})})" for agent in subagents}
+        matrix = askDependencies(tasks, runStepText)
+        if matrix is None:
+            return
+        for agent in subagents:
+            agent.dependencies = matrix[agent.agentName]
+
+    def stepLevels(self, subagents):
+        # Each level only starts once the results it needs are on the blackboard
+        dependencies = {agent.agentName: agent.needsDataFrom() for agent in subagents}
+        levels = dependencyLevels(dependencies)
+        for agent in subagents:
+            agent.dependencies = dependencies[agent.agentName]
+        byName = {agent.agentName: agent for agent in subagents}
+        return [[byName[name] for name in level] for level in levels]
+
+    def runSteps(self, subagents, verbose=False):
+        # Idle agents steal queued steps from busier ones instead of random delegation
+        scheduler = WorkStealingScheduler([agent.agentName for agent in subagents[:self.maxWorkers]])
+        for level in self.stepLevels(subagents):
+            scheduler.distribute(level)
+            scheduler.run(lambda agent, worker: agent.runStep(verbose=verbose))
+        self.schedulerStats = scheduler.stats()
+
     def run(self, userGoal, verbose=False):
         steps = self.decomposeSteps(userGoal)
         results = []
         subagentTasks = {f"SubAgent-{i+1}": step for i, step in enumerate(steps)}
+        # Each run gets its own bus so concurrent runs never share mailboxes, a broker's when BUS_ADDRESS is set
+        bus = connectBus()
+        blackboard = Blackboard()
         subagents = []
         for i, step in enumerate(steps, 1):
             agentName = f"SubAgent-{i}"
-            subagent = SubAgent(step, agentName, self.bus, subagentTasks)
+            subagent = SubAgent(step, agentName, bus, subagentTasks, blackboard)
             subagents.append(subagent)
 
-        for roundNum in range(ROUNDS):
-            for agent in subagents:
-                agent.processMessages(verbose=verbose)
-            if roundNum == 0:
-                for agent in subagents:
-                    agent.runStep(verbose=verbose)
-            if roundNum == 1:
-                for agent in subagents:
-                    agent.askForHelp()
-            if roundNum >= 2:
-                anyMessages = any(agent.receiveMessages() for agent in subagents)
-                if not anyMessages and all(a.completed for a in subagents):
-                    break
+        self.discoverDependencies(subagents)
+        self.runSteps(subagents, verbose)
 
         for agent in subagents:
-            agent.processMessages(verbose=verbose)
             results.append({
                 "step": f"{agent.step['tool']}({agent.step.get('args', {})})",
                 "result": agent.result
             })
+        bus.close()
         return results
 
 
@@ -260,7 +261,7 @@ class MainAgent:
             f"{resultsSummary}\n"
             "Write a clear, natural language answer for the user that references the original request directly."
         )
-        answer = runStepText(prompt)
+        answer = resultFormatter.format(results) or runStepText(prompt)
         if verbose:
             print(f"\n[Final Response]:\n{answer}\n")
         else:
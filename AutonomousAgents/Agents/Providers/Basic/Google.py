@@ -5,6 +5,8 @@ from google import genai
 from google.genai import types
 
 from Utils.SkillGraph import SkillGraph
+from Utils.PlanCache import PlanCache
+from Utils.ResultFormatter import ResultFormatter
 
 # Load environment
 load_dotenv()
@@ -14,6 +16,8 @@ genClient = genai.Client(api_key=apiKey)
 # Load tools + callable functions from SkillGraph
 skillGraph = SkillGraph()
 tools, toolFunctions = skillGraph.getTypedTools()
+planCache = PlanCache()
+resultFormatter = ResultFormatter()
 
 class LlmTool:
     def __init__(self, model="gemini-2.5-flash"):
@@ -50,6 +54,9 @@ class OrchestratorAgent:
         self.toolFunctions = toolFunctions
 
     def decomposeSteps(self, userGoal):
+        plan = planCache.get(userGoal, "Basic.Google")
+        if plan is not None:
+            return plan
         toolList = [
             {"name": name, "signature": (f.__doc__ or "")}
             for name, f in self.toolFunctions.items()
@@ -68,6 +75,7 @@ class OrchestratorAgent:
         except Exception:
             print("Failed to parse plan:", planJson)
             raise
+        planCache.set(userGoal, plan, "Basic.Google")
         return plan
 
     def run(self, userGoal, verbose=False):
@@ -107,7 +115,7 @@ class MainAgent:
             f"{resultsSummary}\n"
             "Write a clear, natural language answer for the user that references the original request directly."
         )
-        answer = runStepText(prompt)
+        answer = resultFormatter.format(results) or runStepText(prompt)
         if verbose:
             print(f"\n[Final Response]:\n{answer}\n")
         else:
@@ -3,6 +3,8 @@ import json
 from dotenv import load_dotenv
 from openai import OpenAI
 from Utils.SkillGraph import SkillGraph
+from Utils.PlanCache import PlanCache
+from Utils.ResultFormatter import ResultFormatter
 
 load_dotenv()
 
@@ -12,6 +14,8 @@ SCHEMA_TYPE = "chat_completions"
 # Load tools and functions together
 skillGraph = SkillGraph()
 tools, toolFunctions = skillGraph.getJsonTools(SCHEMA_TYPE)
+planCache = PlanCache()
+resultFormatter = ResultFormatter()
 
 class LlmTool:
     def __init__(self, model="gpt-4o"):
@@ -81,6 +85,9 @@ class OrchestratorAgent:
         self.toolSchemas   = tools
 
     def decomposeSteps(self, userGoal):
+        plan = planCache.get(userGoal, "Basic.OpenAI_C")
+        if plan is not None:
+            return plan
         toolList = [
             {
                 "name": schema["function"]["name"],
@@ -105,6 +112,7 @@ class OrchestratorAgent:
         except Exception:
             print("Failed to parse plan:", planJson)
             raise
+        planCache.set(userGoal, plan, "Basic.OpenAI_C")
         return plan
 
     def run(self, userGoal, verbose=False):
@@ -145,7 +153,7 @@ class MainAgent:
             f"{resultsSummary}\n"
             "Write a clear, natural language answer for the user that references the original request directly."
         )
-        answer = runStepText(prompt)
+        answer = resultFormatter.format(results) or runStepText(prompt)
         if verbose:
             print(f"\n[Final Response]:\n{answer}\n")
         else:
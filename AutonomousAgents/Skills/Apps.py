@@ -49,7 +49,9 @@ class Apps:
     def _metaData(self):
         return {
             "className": f"{self.__class__.__name__}", 
-            "description": "Open and close applications on my computer"
+            "description": "Open and close applications on my computer",
+            "threadSafe": False,
+            "cacheTTL": 0,
         }
 
     def appSkill(self, action: str, *args):
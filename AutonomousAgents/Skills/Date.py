@@ -1,13 +1,15 @@
 
 from datetime import datetime
 from HoloLink import ArgumentParser
+from Utils.CachePolicy import cachePolicy
 
 argParser = ArgumentParser()
 
+@cachePolicy(ttl=60, threadSafe=True)
 def getDate():
     """
     Description: "Get the current date in DD-MM-YYYY format."
     Additional Information: "This function returns the current date formatted as day-month-year."
     """
     argParser.printArgs(__name__, locals())
-    return datetime.now().strftime('%d-%B-%Y')
\ No newline at end of file
+    return datetime.now().strftime('%d-%B-%Y')
@@ -4,9 +4,6 @@ import logging
 import os
 import threading
 from dotenv import load_dotenv
-from openai import OpenAI
-from google import genai
-from google.genai import types
 from HoloLink import HoloLink
 
 logger = logging.getLogger(__name__)
@@ -35,12 +32,35 @@ class Research:
     def _initComponents(self):
         self.holoLink = HoloLink()
         self.provider  = os.getenv("PROVIDER", "openai")
-        self.gptClient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.genClient = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        self._gptClient = None
+        self._genClient = None
         self.actionMap = {
             "research": self._research
         }
 
+    def _metaData(self):
+        return {
+            "className": f"{self.__class__.__name__}",
+            "description": "Research a topic using web search capabilities.",
+            "threadSafe": True,
+            "cacheTTL": 3600,
+        }
+
+    # The provider SDKs are only imported and their clients created on the first research call.
+    @property
+    def gptClient(self):
+        if self._gptClient is None:
+            from openai import OpenAI
+            self._gptClient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._gptClient
+
+    @property
+    def genClient(self):
+        if self._genClient is None:
+            from google import genai
+            self._genClient = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        return self._genClient
+
     def researchSkill(self, action: str, *args):
         """
         Description: "Research a topic using web search capabilities."
@@ -66,6 +86,7 @@ class Research:
         ).output_text
 
     def _research_google(self, instructions: str):
+        from google.genai import types
         return self.genClient.models.generate_content(
             model="gemini-2.0-flash",
             contents=[types.Content(role="user", parts=[types.Part.from_text(text=instructions)])],
@@ -1,13 +1,15 @@
 
 from datetime import datetime
 from HoloLink import ArgumentParser
+from Utils.CachePolicy import cachePolicy
 
 argParser = ArgumentParser()
 
+@cachePolicy(ttl=1, threadSafe=True)
 def getTime():
     """
     Description: "Get the current time in HH:MM format."
     Additional Information: "This function returns the current time formatted as hour:minute."
     """
     argParser.printArgs(__name__, locals())
-    return datetime.now().strftime('%H:%M')
\ No newline at end of file
+    return datetime.now().strftime('%H:%M')
@@ -14,6 +14,8 @@ import inspect
 from datetime import datetime
 
 from HoloLink import HoloLink
+from Utils.HttpClient import HttpClient
+from Utils.GridCache import forecastCache
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,7 @@ class Weather:
 
     def _initComponents(self):
         self.holoLink = HoloLink()
+        self.httpClient = HttpClient()
         ##------------- When defining signatures, you can choose between dictSig or listSig -------------##
         # dictSig is more descriptive and allows you to specify types for function arguments
         # listSig is simpler and just specifies argument names without types
@@ -66,6 +69,8 @@ class Weather:
         return {
             "className": f"{self.__class__.__name__}", 
             "description": "Get current weather information such as temperature, humidity, and wind speed for a given location.",
+            "threadSafe": True,
+            "cacheTTL": 600,
         }
 
     def weatherSkill(self, action: str, *args):
@@ -74,21 +79,39 @@ class Weather:
         return self.holoLink.executeSkill('system', name, self.actionMap, action, *args)
 
     def _getWeather(self, infoDict: dict) -> str:
-        latitude = infoDict.get("latitude")
-        longitude = infoDict.get("longitude")
-        temperature_info = self._getTemperature([latitude, longitude])
-        humidity_info = self._getHumidity([latitude, longitude])
-        wind_speed_info = self._getWindSpeed([latitude, longitude])
+        # One request carries everything the three readings need
+        data = self._fetchForecast(infoDict.get("latitude"), infoDict.get("longitude"))
+        temperature_info = self._formatTemperature(data)
+        humidity_info = self._formatHumidity(data)
+        wind_speed_info = self._formatWindSpeed(data)
         return f"{temperature_info}\n{humidity_info}\n{wind_speed_info}"
 
-
     def _getTemperature(self, infoDict: dict) -> str:
-        latitude = infoDict.get("latitude")
-        longitude = infoDict.get("longitude")
-        response = requests.get(
-            f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-        )
-        data = response.json()
+        data = self._fetchForecast(infoDict.get("latitude"), infoDict.get("longitude"))
+        return self._formatTemperature(data)
+
+    def _getHumidity(self, infoDict: dict) -> str:
+        data = self._fetchForecast(infoDict.get("latitude"), infoDict.get("longitude"))
+        return self._formatHumidity(data)
+
+    def _getWindSpeed(self, infoDict: dict) -> str:
+        data = self._fetchForecast(infoDict.get("latitude"), infoDict.get("longitude"))
+        return self._formatWindSpeed(data)
+
+    def _fetchForecast(self, latitude, longitude) -> dict:
+        # Nearby coordinates share one forecast, fetched for the center of their grid cell
+        return forecastCache.getOrFetch(latitude, longitude, self._requestForecast)
+
+    def _requestForecast(self, latitude, longitude) -> dict:
+        try:
+            return self.httpClient.getJson(
+                f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true&hourly=relative_humidity_2m"
+            )
+        except requests.RequestException as e:
+            logger.error(f"Forecast request for {latitude}, {longitude} failed:", exc_info=True)
+            return {"error": str(e)}
+
+    def _formatTemperature(self, data: dict) -> str:
         if "current_weather" in data and "temperature" in data["current_weather"]:
             c = data["current_weather"]["temperature"]
             f = c * 9/5 + 32
@@ -96,15 +119,10 @@ class Weather:
         else:
             return f"Could not fetch current weather. Response: {json.dumps(data)}"
 
-    def _getHumidity(self, infoDict: dict) -> str:
-        latitude = infoDict.get("latitude")
-        longitude = infoDict.get("longitude")
-        response = requests.get(
-            f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true&hourly=relative_humidity_2m"
-        )
-        data = response.json()
+    def _formatHumidity(self, data: dict) -> str:
         try:
-            now = datetime.utcnow().replace(minute=0, second=0, microsecond=0).isoformat()
+            # The hourly series is in UTC and its timestamps have no seconds
+            now = datetime.utcnow().strftime('%Y-%m-%dT%H:00')
             times = data['hourly']['time']
             humidities = data['hourly']['relative_humidity_2m']
             idx = times.index(now)
@@ -113,13 +131,7 @@ class Weather:
         except Exception:
             return f"Could not fetch humidity. Response: {data}"
 
-    def _getWindSpeed(self, infoDict: dict) -> str:
-        latitude = infoDict.get("latitude")
-        longitude = infoDict.get("longitude")
-        response = requests.get(
-            f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-        )
-        data = response.json()
+    def _formatWindSpeed(self, data: dict) -> str:
         try:
             wind_speed = data['current_weather']['windspeed']
             return f"Current wind speed: {wind_speed} m/s"
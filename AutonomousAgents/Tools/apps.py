@@ -6,6 +6,7 @@ import threading
 import inspect
 
 from HoloAI import HoloLink
+from Utils.CachePolicy import cachePolicy
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,7 @@ class Apps:
             appName
         )
 
+    @cachePolicy(ttl=0)
     def openApp(self, appName: str) -> str:
         """
         Description: "Open an application on the computer."
@@ -67,6 +69,7 @@ class Apps:
             logger.error(f"Error opening {app}:", exc_info=True)
             return f"An error occurred while trying to open {app}: {e}"
 
+    @cachePolicy(ttl=0)
     def closeApp(self, appName: str) -> str:
         """
         Description: "Close an application on the computer."
@@ -1,9 +1,11 @@
 
 from datetime import datetime
 from HoloAI import HoloLink
+from Utils.CachePolicy import cachePolicy
 
 holoLink = HoloLink()
 
+@cachePolicy(ttl=60)
 def get_current_date():
     """
     Description: "Get the current date in DD-MM-YYYY format."
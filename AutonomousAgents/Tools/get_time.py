@@ -1,9 +1,11 @@
 
 from datetime import datetime
 from HoloAI import HoloLink
+from Utils.CachePolicy import cachePolicy
 
 holoLink = HoloLink()
 
+@cachePolicy(ttl=1)
 def get_current_time():
     """
     Description: "Get the current time in HH:MM format."
@@ -1,63 +1,97 @@
 
 import json
+import logging
 import requests
+from datetime import datetime
 
 from HoloAI import HoloLink
+from Utils.CachePolicy import cachePolicy
+from Utils.HttpClient import HttpClient
+from Utils.GridCache import forecastCache
 
+logger = logging.getLogger(__name__)
 holoLink = HoloLink()
+httpClient = HttpClient()
 
 
+@cachePolicy(ttl=600)
+def get_weather(latitude: float, longitude: float) -> str:
+    """
+    Description: "Get the current temperature, humidity and wind speed for provided coordinates."
+    Additional Information: "Use this instead of calling the three separate weather tools when more than one reading is needed."
+    """
+    holoLink.calledActions(__name__, locals())
+    data = _fetchForecast(latitude, longitude)
+    return f"{_formatTemperature(data)}\n{_formatHumidity(data)}\n{_formatWindSpeed(data)}"
+
+
+@cachePolicy(ttl=600)
 def get_temperature(latitude: float, longitude: float) -> str:
     """
     Description: "Get current temperature for provided coordinates in celsius."
     Additional Information: "Provide the temperature in both Celsius and Fahrenheit."
     """
     holoLink.calledActions(__name__, locals())
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-    )
-    data = response.json()
-    if "current_weather" in data and "temperature" in data["current_weather"]:
-        c = data["current_weather"]["temperature"]
-        f = c * 9/5 + 32
-        return f"Current temperature: {c:.1f} C / {f:.1f} F"
-    else:
-        return f"Could not fetch current weather. Response: {json.dumps(data)}"
+    return _formatTemperature(_fetchForecast(latitude, longitude))
 
 
+@cachePolicy(ttl=600)
 def get_humidity(latitude: float, longitude: float) -> str:
     """
     Description: "Get current relative humidity for provided coordinates."
     Additional Information: "Returns humidity as a percentage."
     """
     holoLink.calledActions(__name__, locals())
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true&hourly=relative_humidity_2m"
-    )
-    data = response.json()
-    try:
-        # Returns current hour's humidity
-        humidity = data['hourly']['relative_humidity_2m'][0]
-        return f"Current humidity: {humidity}%"
-    except Exception:
-        return f"Could not fetch humidity. Response: {data}"
+    return _formatHumidity(_fetchForecast(latitude, longitude))
 
 
+@cachePolicy(ttl=600)
 def get_wind_speed(latitude: float, longitude: float) -> str:
     """
     Description: "Get current wind speed for provided coordinates."
     Additional Information: "Provide the  wind speed in both meters per second (m/s) and miles per hour (mph)."
     """
     holoLink.calledActions(__name__, locals())
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-    )
-    data = response.json()
+    return _formatWindSpeed(_fetchForecast(latitude, longitude))
+
+
+def _fetchForecast(latitude, longitude):
+    return forecastCache.getOrFetch(latitude, longitude, _requestForecast)
+
+
+def _requestForecast(latitude, longitude):
+    try:
+        return httpClient.getJson(
+            f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true&hourly=relative_humidity_2m"
+        )
+    except requests.RequestException as e:
+        logger.error(f"Forecast request for {latitude}, {longitude} failed:", exc_info=True)
+        return {"error": str(e)}
+
+
+def _formatTemperature(data):
+    if "current_weather" in data and "temperature" in data["current_weather"]:
+        c = data["current_weather"]["temperature"]
+        f = c * 9/5 + 32
+        return f"Current temperature: {c:.1f} C / {f:.1f} F"
+    else:
+        return f"Could not fetch current weather. Response: {json.dumps(data)}"
+
+
+def _formatHumidity(data):
+    try:
+        # Returns current hour's humidity, the hourly series is in UTC
+        now = datetime.utcnow().strftime('%Y-%m-%dT%H:00')
+        hourly = data['hourly']
+        humidity = hourly['relative_humidity_2m'][hourly['time'].index(now)]
+        return f"Current humidity: {humidity}%"
+    except Exception:
+        return f"Could not fetch humidity. Response: {data}"
+
+
+def _formatWindSpeed(data):
     try:
         wind_speed = data['current_weather']['windspeed']
         return f"Current wind speed: {wind_speed} m/s"
     except Exception:
         return f"Could not fetch wind speed. Response: {data}"
-
-
-
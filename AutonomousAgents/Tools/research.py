@@ -3,16 +3,29 @@ import os
 from dotenv import load_dotenv
 
 from HoloLink import ArgumentParser
-
-from openai import OpenAI
-from google import genai
-from google.genai import types
+from Utils.CachePolicy import cachePolicy
 
 argParser = ArgumentParser()
 load_dotenv()
-gptClient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-genClient = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-
+gptClient = None
+genClient = None
+
+# Clients are created on first use so importing this tool stays cheap.
+def _getGptClient():
+    global gptClient
+    if gptClient is None:
+        from openai import OpenAI
+        gptClient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return gptClient
+
+def _getGenClient():
+    global genClient
+    if genClient is None:
+        from google import genai
+        genClient = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+    return genClient
+
+@cachePolicy(ttl=3600)
 def research(instructions: str):
     """
     Description: "Research a topic using web search capabilities."
@@ -28,9 +41,10 @@ def research(instructions: str):
         raise ValueError(f"Unsupported provider: {provider}")
 
 def _research_openai(instructions: str):
-    return gptClient.responses.create(model="gpt-4.1-mini", tools=[{ "type": "web_search_preview" }], input=instructions).output_text
+    return _getGptClient().responses.create(model="gpt-4.1-mini", tools=[{ "type": "web_search_preview" }], input=instructions).output_text
 
 def _research_google(instructions: str):
-    return genClient.models.generate_content(model="gemini-2.0-flash", contents=[types.Content(role="user", parts=[types.Part.from_text(text=instructions)])],
+    from google.genai import types
+    return _getGenClient().models.generate_content(model="gemini-2.0-flash", contents=[types.Content(role="user", parts=[types.Part.from_text(text=instructions)])],
                 config=types.GenerateContentConfig(tools=[types.Tool(google_search=types.GoogleSearch())], response_mime_type="text/plain")).text
 
@@ -0,0 +1,93 @@
+import os
+import threading
+import logging
+from collections import defaultdict
+from concurrent.futures import Future, wait as waitFutures
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class Blackboard:
+    """
+    Shared, versioned key store for the results of one run.
+    Every sub-agent publishes its result once under its own name, and the agents that depend on it
+    read it from here, waiting on a future if it isn't there yet. Sharing results costs no messages
+    and no extra rounds. Every publish bumps the board's version and the entry keeps the version it
+    was written at, so readers can tell a result has been replaced.
+    """
+    def __init__(self, timeout=None):
+        self.timeout     = float(os.getenv('BLACKBOARD_TIMEOUT', '60')) if timeout is None else timeout
+        self.version     = 0
+        self.entries     = {}                  # key -> (version, value)
+        self.futures     = {}                  # key -> Future resolved by the first publish
+        self.subscribers = defaultdict(list)   # key (None = every key) -> callbacks
+        self._lock       = threading.Lock()
+
+    def publish(self, key, value):
+        """
+        Store value under key and wake everyone waiting for it. Returns the entry's version.
+        """
+        with self._lock:
+            self.version += 1
+            version = self.version
+            self.entries[key] = (version, value)
+            future = self.futures.setdefault(key, Future())
+            if not future.done():
+                future.set_result(value)
+            callbacks = self.subscribers.get(key, []) + self.subscribers.get(None, [])
+        for callback in callbacks:
+            try:
+                callback(key, value, version)
+            except Exception as e:
+                logger.error(f"Blackboard subscriber for {key} failed: {e}", exc_info=True)
+        return version
+
+    def get(self, key, default=None):
+        """
+        Return the current value for key without waiting.
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+        return default if entry is None else entry[1]
+
+    def entry(self, key):
+        """
+        Return (version, value) for key, or None if nothing was published under it.
+        """
+        with self._lock:
+            return self.entries.get(key)
+
+    def future(self, key):
+        """
+        Return a future that resolves with the first value published under key.
+        """
+        with self._lock:
+            return self.futures.setdefault(key, Future())
+
+    def wait(self, keys, timeout=None):
+        """
+        Block until every key has been published or timeout seconds pass, and return {key: value}.
+        Keys still missing at the timeout are left out and logged.
+        """
+        futures = {key: self.future(key) for key in keys}
+        _, missing = waitFutures(list(futures.values()), timeout=self.timeout if timeout is None else timeout)
+        if missing:
+            logger.warning(f"Blackboard keys still missing after waiting: {', '.join(k for k, f in futures.items() if f in missing)}")
+        return {key: self.get(key) for key, future in futures.items() if future not in missing}
+
+    def subscribe(self, callback, key=None):
+        """
+        Call callback(key, value, version) after every publish of key, or of any key if key is None.
+        """
+        with self._lock:
+            self.subscribers[key].append(callback)
+
+    def snapshot(self):
+        """
+        Return {key: value} for everything published so far.
+        """
+        with self._lock:
+            return {key: value for key, (_, value) in self.entries.items()}
@@ -0,0 +1,14 @@
+def cachePolicy(ttl=None, threadSafe=None):
+    """
+    Declare how SkillGraph may treat a tool or function skill.
+    ttl is how many seconds a result can be reused for identical arguments, 0 means never cache.
+    threadSafe marks a function skill as safe to run alongside other actions.
+    The function itself is returned unchanged, only the attributes are set.
+    """
+    def decorate(func):
+        if ttl is not None:
+            func.cacheTTL = ttl
+        if threadSafe is not None:
+            func.threadSafe = threadSafe
+        return func
+    return decorate
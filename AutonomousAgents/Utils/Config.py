@@ -1,16 +1,25 @@
 import random
 import os
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime
 from Utils.Names import MAIN_MINIONS, SUB_MINIONS
 from Utils.SkillGraph import SkillGraph
+from Utils.ResponseCache import ResponseCache
+from Utils.PlanCache import PlanCache
+from Utils.ResultFormatter import ResultFormatter
+from Utils.MessageBus import MessageBus
 # from HoloAI import HoloRelay
 
 # from openai import OpenAI
 # from google import genai
 # from google.genai import types
 
-from HoloAI import (HoloAI, HoloRelay)
+from HoloAI import HoloAI
 
 load_dotenv()
 # gptClient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -26,40 +35,122 @@ load_dotenv()
 # Add Provider models to the modelMap in AgentTool class.
 
 graph = SkillGraph()
+planCache = PlanCache()
+resultFormatter = ResultFormatter()
 skillInstructions = graph.skillInstructions()
-ROUNDS = 10
+
+# Shared across every AgentTool so repeated clarify/decompose prompts skip the LLM round trip.
+# Off unless RESPONSE_CACHE=True, since a cached answer replaces a fresh, possibly different one.
+# RESPONSE_CACHE_DB is optional, set it to a file path to keep cached responses across restarts.
+responseCache = ResponseCache(
+    maxSize=int(os.getenv("RESPONSE_CACHE_SIZE", "512")),
+    ttl=int(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+    dbPath=os.getenv("RESPONSE_CACHE_DB") or None,
+) if os.getenv("RESPONSE_CACHE", "False") == "True" else None
 
 
 class AgentTool:
-    def __init__(self):
+    # Per-provider limits on in-flight LLM calls, shared by every AgentTool in the process.
+    concurrencyMap = {
+        "openai": int(os.getenv("OPENAI_CONCURRENCY", "8")),
+        "google": int(os.getenv("GOOGLE_CONCURRENCY", "8")),
+    }
+    _threadLimits = {}
+    _asyncLimits  = weakref.WeakKeyDictionary()
+    _executor     = None
+    _lock         = threading.Lock()
+
+    def __init__(self, cache=None):
         self.holoAI = HoloAI()
         self.provider = os.getenv("PROVIDER", "openai")
         self.modelMap = {
             "openai": "gpt-4.1-mini",
             "google": "gemini-2.5-flash",
         }
+        self.cache = cache if cache is not None else responseCache
 
-    def run(self, systemMsg, userMsg):
+    def getModel(self):
         try:
-            return self.holoAI.Agent(
-                task='response',
-                model=self.modelMap[self.provider],
-                system=systemMsg,
-                input=userMsg
-            )
+            return self.modelMap[self.provider]
         except KeyError:
             raise ValueError("Invalid LLM provider. Use 'openai' or 'google'.")
 
+    def run(self, systemMsg, userMsg):
+        model = self.getModel()
+        if self.cache is None:
+            return self._call(model, systemMsg, userMsg)
+        key = self.cache.makeKey(self.provider, model, systemMsg, userMsg)
+        response = self.cache.get(key)
+        if response is None:
+            response = self._call(model, systemMsg, userMsg)
+            if response:
+                self.cache.set(key, response)
+        return response
+
+    async def arun(self, systemMsg, userMsg):
+        model = self.getModel()
+        key = self.cache.makeKey(self.provider, model, systemMsg, userMsg) if self.cache is not None else None
+        # The cache can hit SQLite, so it is read and written off the event loop too
+        if key is not None:
+            response = await asyncio.to_thread(self.cache.get, key)
+            if response is not None:
+                return response
+        response = await self.acall(self.holoAI.Agent, task='response', model=model, system=systemMsg, input=userMsg)
+        if key is not None and response:
+            await asyncio.to_thread(self.cache.set, key, response)
+        return response
+
+    async def acall(self, func, *args, **kwargs):
+        """
+        Run a blocking provider call off the event loop, bounded by the provider's concurrency limit.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._asyncLimit(loop):
+            return await loop.run_in_executor(
+                self._getExecutor(), functools.partial(self._limited, func, *args, **kwargs)
+            )
 
-class AgentMessageBus:
-    def __init__(self):
-        self.holoRelay = HoloRelay()
-
-    def send(self, fromAgent, toAgent, content):
-        self.holoRelay.send(fromAgent, toAgent, content)
-
-    def receive(self, agentName, allowedFrom=None):
-        return self.holoRelay.receive(agentName, allowedFrom)
+    def _call(self, model, systemMsg, userMsg):
+        return self._limited(
+            self.holoAI.Agent,
+            task='response',
+            model=model,
+            system=systemMsg,
+            input=userMsg
+        )
+
+    def _limited(self, func, *args, **kwargs):
+        with self._threadLimit():
+            return func(*args, **kwargs)
+
+    def _limit(self):
+        return max(1, self.concurrencyMap.get(self.provider, 8))
+
+    def _threadLimit(self):
+        with AgentTool._lock:
+            if self.provider not in AgentTool._threadLimits:
+                AgentTool._threadLimits[self.provider] = threading.BoundedSemaphore(self._limit())
+            return AgentTool._threadLimits[self.provider]
+
+    def _asyncLimit(self, loop):
+        with AgentTool._lock:
+            limits = AgentTool._asyncLimits.setdefault(loop, {})
+            if self.provider not in limits:
+                limits[self.provider] = asyncio.Semaphore(self._limit())
+            return limits[self.provider]
+
+    @classmethod
+    def _getExecutor(cls):
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=sum(cls.concurrencyMap.values()), thread_name_prefix="AgentTool"
+                )
+            return cls._executor
+
+
+# Kept for code that still builds the bus by its old name
+AgentMessageBus = MessageBus
 
 
 # class AgentTool:
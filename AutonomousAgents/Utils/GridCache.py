@@ -0,0 +1,111 @@
+import os
+import threading
+import logging
+from dotenv import load_dotenv
+from Utils.ResponseCache import ResponseCache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class GridCache:
+    """
+    Spatial cache for location based payloads such as forecasts.
+    Coordinates are snapped to the nearest cell of a regular grid (cellSize degrees) and the payload
+    is fetched once for the cell center, so every request that falls in the same cell shares it.
+    Concurrent misses for one cell wait for a single fetch instead of each going upstream.
+    """
+    def __init__(self, cellSize=0.05, ttl=900, maxSize=1024):
+        self.cellSize  = cellSize
+        self.ttl       = ttl
+        self.cache     = ResponseCache(maxSize=maxSize, ttl=ttl)
+        self.fetches   = 0
+        self._inflight = {}
+        self._lock     = threading.Lock()
+
+    def cell(self, latitude, longitude):
+        """
+        Return the (row, column) of the grid cell nearest to the coordinates.
+        Longitudes are wrapped to [-180, 180) so both sides of the antimeridian agree.
+        """
+        latitude  = max(-90.0, min(90.0, float(latitude)))
+        longitude = (float(longitude) + 180.0) % 360.0 - 180.0
+        return round(latitude / self.cellSize), round(longitude / self.cellSize)
+
+    def center(self, cell):
+        """
+        Return the coordinates of a cell's center.
+        """
+        return round(cell[0] * self.cellSize, 4), round(cell[1] * self.cellSize, 4)
+
+    def get(self, latitude, longitude):
+        """
+        Return the cached payload for the cell containing the coordinates, or None.
+        """
+        return self.cache.get(self._key(self.cell(latitude, longitude)))
+
+    def set(self, latitude, longitude, payload):
+        """
+        Store a payload for the cell containing the coordinates.
+        """
+        self.cache.set(self._key(self.cell(latitude, longitude)), payload)
+
+    def getOrFetch(self, latitude, longitude, fetch):
+        """
+        Return the payload for the coordinates' cell, calling fetch(centerLatitude, centerLongitude) on a miss.
+        Payloads with an "error" key are returned but not cached. Coordinates that aren't numbers
+        skip the grid and are fetched as given.
+        """
+        try:
+            cell = self.cell(latitude, longitude)
+        except (TypeError, ValueError):
+            return fetch(latitude, longitude)
+        key     = self._key(cell)
+        payload = self.cache.get(key)
+        if payload is not None:
+            return payload
+
+        with self._lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+        if not leader:
+            event.wait()
+            payload = self.cache.get(key)
+            if payload is not None:
+                return payload
+            return fetch(*self.center(cell))
+
+        try:
+            payload = fetch(*self.center(cell))
+            with self._lock:
+                self.fetches += 1
+            if isinstance(payload, dict) and "error" not in payload:
+                self.cache.set(key, payload)
+            return payload
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def _key(self, cell):
+        return f"{self.cellSize}:{cell[0]}:{cell[1]}"
+
+    def stats(self):
+        """
+        Return hit/miss counters and how many upstream fetches were made.
+        """
+        stats = self.cache.stats()
+        stats["fetches"] = self.fetches
+        return stats
+
+
+# Shared by the weather skill and the weather tools, so both reuse the same forecasts.
+# Open-Meteo refreshes its current conditions every 15 minutes, hence the default TTL.
+forecastCache = GridCache(
+    cellSize=float(os.getenv('WEATHER_GRID', '0.05')),
+    ttl=int(os.getenv('WEATHER_GRID_TTL', '900')),
+    maxSize=int(os.getenv('WEATHER_GRID_SIZE', '1024')),
+)
@@ -0,0 +1,102 @@
+import os
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """
+    Shared HTTP client for network skills and tools.
+    One requests.Session with a pooled adapter keeps connections alive between calls, every request
+    gets connect and read timeouts, and failed GETs are retried a bounded number of times with
+    exponential backoff. The adapter's pool is thread-safe, so sub-agents can share the client.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(HttpClient, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, 'initialized', False):
+            return
+        self._initComponents()
+        self.initialized = True
+
+    def _initComponents(self):
+        self.timeout  = (
+            float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05')),
+            float(os.getenv('HTTP_READ_TIMEOUT', '10')),
+        )
+        self.retry    = Retry(
+            total=int(os.getenv('HTTP_RETRIES', '3')),
+            backoff_factor=float(os.getenv('HTTP_BACKOFF', '0.5')),
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+        )
+        poolSize      = int(os.getenv('HTTP_POOL_SIZE', '16'))
+        self.adapter  = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize, max_retries=self.retry)
+        self.session  = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.requests = 0
+        self.retries  = 0
+        self.failures = 0
+        self._counterLock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        """
+        GET url through the pooled session and return the response.
+        timeout defaults to the configured (connect, read) pair. Raises requests.RequestException
+        once the retries are exhausted.
+        """
+        try:
+            response = self.session.get(url, params=params, timeout=timeout or self.timeout, **kwargs)
+        except requests.RequestException:
+            with self._counterLock:
+                self.requests += 1
+                self.failures += 1
+            raise
+        retries = getattr(getattr(response.raw, 'retries', None), 'history', ()) or ()
+        with self._counterLock:
+            self.requests += 1
+            self.retries  += len(retries)
+        return response
+
+    def getJson(self, url, params=None, timeout=None, **kwargs):
+        """
+        GET url and return the decoded JSON body.
+        """
+        return self.get(url, params=params, timeout=timeout, **kwargs).json()
+
+    def stats(self):
+        """
+        Return request, retry and connection counters.
+        connections is how many TCP connections were opened, so reuseRate is the share of
+        requests served over an already open connection.
+        """
+        connections = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+        with self._counterLock:
+            return {
+                "requests":    self.requests,
+                "retries":     self.retries,
+                "failures":    self.failures,
+                "connections": connections,
+                "reuseRate":   max(0.0, 1 - connections / self.requests) if self.requests else 0.0,
+            }
@@ -0,0 +1,174 @@
+import ast
+import inspect
+import builtins
+import threading
+import importlib.util
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class LazyTools:
+    """
+    Lazy loading of the Tools directory.
+    At boot every tool file is only parsed, and each public function (or public method of a tool class)
+    becomes a proxy carrying the real name, docstring and signature, which is all schema building needs.
+    The module is imported, and its class instantiated, the first time one of its tools is called.
+    """
+    def __init__(self, directory):
+        self.directory   = Path(directory).resolve()
+        self.modules     = {}
+        self.instances   = {}
+        self.mtimes      = {}
+        self.fileProxies = {}
+        self.proxies     = {}
+        self._lock     = threading.RLock()
+
+    def scan(self, paths=None):
+        """
+        Parse tool files and rebuild their proxies, every file in the directory or only the given paths.
+        Modules whose file changed or disappeared since they were imported are dropped, so they are
+        imported again on their next call.
+        """
+        if paths is None:
+            paths = [path for path in self.directory.glob('*.py') if not path.name.startswith('_')]
+        for path in (Path(p).resolve() for p in paths):
+            try:
+                mtime = path.stat().st_mtime
+                tree  = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+            except FileNotFoundError:
+                mtime, tree = None, None
+            except (OSError, SyntaxError):
+                logger.error(f"Could not parse tool file {path}:", exc_info=True)
+                continue
+            with self._lock:
+                if self.mtimes.get(path) != mtime:
+                    self.modules.pop(path, None)
+                    self.instances = {key: value for key, value in self.instances.items() if key[0] != path}
+                    self.mtimes[path] = mtime
+                if tree is None:
+                    self.fileProxies.pop(path, None)
+                    self.mtimes.pop(path, None)
+                else:
+                    self.fileProxies[path] = list(self._proxiesFor(path, tree))
+        self.proxies = {proxy.__name__: proxy for path in sorted(self.fileProxies) for proxy in self.fileProxies[path]}
+        return self.proxies
+
+    def tools(self):
+        """
+        Return {name: proxy} for every tool, scanning the directory the first time.
+        Same shape as HoloLink.getTools, so SkillGraph handles both the same way.
+        """
+        return self.proxies or self.scan()
+
+    def _proxiesFor(self, path, tree):
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith('_'):
+                yield self._proxy(path, None, node)
+            elif isinstance(node, ast.ClassDef):
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and not item.name.startswith('_'):
+                        yield self._proxy(path, node.name, item)
+
+    def _proxy(self, path, className, node):
+        loader = self
+
+        def proxy(*args, **kwargs):
+            return loader.resolve(path, className, node.name)(*args, **kwargs)
+
+        signature = self._signature(node, skipSelf=className is not None)
+        proxy.__name__        = node.name
+        proxy.__qualname__    = f"{className}.{node.name}" if className else node.name
+        proxy.__module__      = path.stem
+        proxy.__doc__         = ast.get_docstring(node)
+        proxy.__signature__   = signature
+        proxy.__annotations__ = {
+            name: param.annotation for name, param in signature.parameters.items()
+            if param.annotation is not inspect.Parameter.empty
+        }
+        if signature.return_annotation is not inspect.Signature.empty:
+            proxy.__annotations__['return'] = signature.return_annotation
+        proxy.sourcePath = str(path)
+        proxy.__dict__.update(self._policy(node))
+        return proxy
+
+    def _policy(self, node):
+        """
+        Read the arguments of a cachePolicy(...) decorator without importing the module.
+        """
+        for decorator in node.decorator_list:
+            if not (isinstance(decorator, ast.Call) and ast.unparse(decorator.func).endswith('cachePolicy')):
+                continue
+            arguments = dict(zip(('ttl', 'threadSafe'), decorator.args))
+            arguments.update({keyword.arg: keyword.value for keyword in decorator.keywords})
+            policy = {}
+            for name, attribute in (('ttl', 'cacheTTL'), ('threadSafe', 'threadSafe')):
+                try:
+                    value = ast.literal_eval(arguments[name]) if name in arguments else None
+                except (ValueError, TypeError, SyntaxError):
+                    value = None
+                if value is not None:
+                    policy[attribute] = value
+            return policy
+        return {}
+
+    def _signature(self, node, skipSelf=False):
+        args       = node.args
+        positional = args.posonlyargs + args.args
+        if skipSelf and positional:
+            positional = positional[1:]
+        defaults   = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+        params     = []
+        for arg, default in zip(positional, defaults):
+            params.append(self._parameter(arg, inspect.Parameter.POSITIONAL_OR_KEYWORD, default))
+        if args.vararg:
+            params.append(self._parameter(args.vararg, inspect.Parameter.VAR_POSITIONAL))
+        for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+            params.append(self._parameter(arg, inspect.Parameter.KEYWORD_ONLY, default))
+        if args.kwarg:
+            params.append(self._parameter(args.kwarg, inspect.Parameter.VAR_KEYWORD))
+        returns = self._annotation(node.returns)
+        return inspect.Signature(params, return_annotation=returns)
+
+    def _parameter(self, arg, kind, default=None):
+        value = inspect.Parameter.empty
+        if default is not None:
+            try:
+                value = ast.literal_eval(default)
+            except (ValueError, TypeError, SyntaxError):
+                value = ast.unparse(default)
+        return inspect.Parameter(arg.arg, kind, default=value, annotation=self._annotation(arg.annotation))
+
+    def _annotation(self, node):
+        if node is None:
+            return inspect.Parameter.empty
+        text = ast.unparse(node)
+        value = getattr(builtins, text, None)
+        return value if isinstance(value, type) else text
+
+    def resolve(self, path, className, name):
+        """
+        Import the tool's module on first use and return the real callable.
+        """
+        with self._lock:
+            module = self.modules.get(path)
+            if module is None:
+                spec   = importlib.util.spec_from_file_location(path.stem, path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                self.modules[path] = module
+                logger.info(f"Lazily loaded tool module {path.name}")
+            if className is None:
+                return getattr(module, name)
+            instance = self.instances.get((path, className))
+            if instance is None:
+                instance = self.instances[(path, className)] = getattr(module, className)()
+            return getattr(instance, name)
+
+    def loaded(self):
+        """
+        Return the names of the tool modules imported so far.
+        """
+        with self._lock:
+            return sorted(path.stem for path in self.modules)
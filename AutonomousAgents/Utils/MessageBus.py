@@ -0,0 +1,187 @@
+import os
+import heapq
+import itertools
+import threading
+import logging
+from collections import defaultdict, deque
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BROADCAST = "*"
+POLICIES  = ("block", "dropOldest", "dropNewest")
+
+
+class MessageBus:
+    """
+    In-process message bus for agents.
+    Every recipient has its own mailbox, split into one deque per sender, so receive with allowedFrom
+    only touches the senders asked for. Broadcasts (toAgent None) go to the subscribers of the
+    broadcast topic, and publish reaches the subscribers of any other topic.
+    Mailboxes can be bounded (maxQueue). When one is full the oldest message is dropped by default
+    ("dropOldest"), the new one is dropped ("dropNewest") or the sender blocks until the recipient
+    catches up ("block"), which only suits mailboxes someone drains.
+    Messages are dicts with "from", "to" and "content", like HoloRelay's.
+    """
+    def __init__(self, onSend=None, maxQueue=None, policy=None, blockTimeout=None):
+        self.maxQueue     = int(os.getenv('BUS_MAX_QUEUE', '0')) if maxQueue is None else maxQueue
+        self.policy       = policy or os.getenv('BUS_POLICY', 'dropOldest')
+        self.blockTimeout = float(os.getenv('BUS_BLOCK_TIMEOUT', '5')) if blockTimeout is None else blockTimeout
+        if self.policy not in POLICIES:
+            raise ValueError(f"Unknown bus policy {self.policy}, use one of {', '.join(POLICIES)}.")
+        # Called as onSend(fromAgent, toAgent) after every send so schedulers can wake the recipient
+        self.onSend       = onSend
+        self.mailboxes    = {}
+        self.sizes        = defaultdict(int)
+        self.topics       = defaultdict(set)
+        self.sent         = 0
+        self.dropped      = 0
+        self._sequence    = itertools.count()
+        self._lock        = threading.Lock()
+        self._space       = threading.Condition(self._lock)
+        self._arrival     = threading.Condition(self._lock)
+
+    def subscribe(self, agentName, topic=BROADCAST):
+        """
+        Subscribe an agent to a topic. Agents subscribed to the broadcast topic receive send(..., None, ...).
+        """
+        with self._lock:
+            self.topics[topic].add(agentName)
+            self.mailboxes.setdefault(agentName, {})
+
+    def unsubscribe(self, agentName, topic=BROADCAST):
+        """
+        Stop delivering topic messages to an agent. Messages already queued stay in its mailbox.
+        """
+        with self._lock:
+            self.topics[topic].discard(agentName)
+
+    def send(self, fromAgent, toAgent, content):
+        """
+        Send content to toAgent, or to every broadcast subscriber except the sender if toAgent is None.
+        """
+        if toAgent is None:
+            self.publish(fromAgent, BROADCAST, content)
+            return
+        with self._lock:
+            seq = self._stamp(fromAgent, toAgent, [toAgent], content)
+            self._deliver(seq, fromAgent, toAgent, toAgent, content)
+        if self.onSend:
+            self.onSend(fromAgent, toAgent)
+
+    def publish(self, fromAgent, topic, content):
+        """
+        Send content to every subscriber of topic except the sender.
+        """
+        with self._lock:
+            recipients = [name for name in self.topics.get(topic, ()) if name != fromAgent]
+            seq = self._stamp(fromAgent, None, recipients, content)
+            for name in recipients:
+                self._deliver(seq, fromAgent, name, None, content)
+        if self.onSend:
+            self.onSend(fromAgent, None)
+
+    def _stamp(self, fromAgent, toAgent, recipients, content):
+        """
+        Return the sequence number of a new send. Called once per send, under the bus lock,
+        so subclasses can record the message before it is delivered.
+        """
+        return next(self._sequence)
+
+    def _deliver(self, seq, fromAgent, recipient, toAgent, content):
+        if self.maxQueue and self.sizes[recipient] >= self.maxQueue:
+            if self.policy == "block":
+                if not self._space.wait_for(lambda: self.sizes[recipient] < self.maxQueue, self.blockTimeout):
+                    self._drop(recipient, f"mailbox of {recipient} stayed full for {self.blockTimeout:g}s")
+                    return
+            elif self.policy == "dropNewest":
+                self._drop(recipient, f"mailbox of {recipient} is full")
+                return
+            else:
+                self._dropOldest(recipient)
+        message = {"from": fromAgent, "to": toAgent, "content": content}
+        mailbox = self.mailboxes.setdefault(recipient, {})
+        mailbox.setdefault(fromAgent, deque()).append((seq, message))
+        self.sizes[recipient] += 1
+        self.sent += 1
+        self._arrival.notify_all()
+
+    def _drop(self, recipient, reason):
+        self.dropped += 1
+        logger.warning(f"Dropped a message for {recipient}: {reason}.")
+
+    def _dropOldest(self, recipient):
+        queues = [queue for queue in self.mailboxes[recipient].values() if queue]
+        oldest = min(queues, key=lambda queue: queue[0][0])
+        oldest.popleft()
+        self.sizes[recipient] -= 1
+        self._drop(recipient, "mailbox is full, oldest message discarded")
+
+    def receive(self, agentName, allowedFrom=None, timeout=0):
+        """
+        Take and return the messages waiting for agentName in the order they were sent.
+        With allowedFrom only those senders' messages are taken, the rest stay queued.
+        With a timeout the call blocks until a message for agentName arrives or timeout seconds pass
+        (None waits for ever), so a recipient is woken by the send itself instead of polling.
+        """
+        if timeout != 0:
+            with self._lock:
+                self._arrival.wait_for(lambda: self._hasMessages(agentName, allowedFrom), timeout)
+        return [message for _, message in self._take(agentName, allowedFrom)]
+
+    def _hasMessages(self, agentName, allowedFrom=None):
+        mailbox = self.mailboxes.get(agentName) or {}
+        senders = mailbox.keys() if allowedFrom is None else [s for s in allowedFrom if s in mailbox]
+        return any(mailbox[sender] for sender in senders)
+
+    def _take(self, agentName, allowedFrom=None):
+        with self._lock:
+            mailbox = self.mailboxes.get(agentName)
+            if not mailbox:
+                return []
+            senders = mailbox.keys() if allowedFrom is None else [s for s in allowedFrom if s in mailbox]
+            queues  = [mailbox[sender] for sender in list(senders) if mailbox[sender]]
+            entries = list(heapq.merge(*queues, key=lambda entry: entry[0]))
+            for queue in queues:
+                queue.clear()
+            if entries:
+                self.sizes[agentName] -= len(entries)
+                self._space.notify_all()
+            return entries
+
+    def forget(self, names):
+        """
+        Remove the mailboxes and topics of names, queued messages included, once nobody uses them anymore.
+        """
+        with self._lock:
+            for name in names:
+                self.mailboxes.pop(name, None)
+                self.sizes.pop(name, None)
+                self.topics.pop(name, None)
+                for subscribers in self.topics.values():
+                    subscribers.discard(name)
+            self._space.notify_all()
+            self._arrival.notify_all()
+
+    def pending(self, agentName=None):
+        """
+        Return how many messages are waiting for agentName, or for everyone if agentName is None.
+        """
+        with self._lock:
+            if agentName is None:
+                return sum(self.sizes.values())
+            return self.sizes.get(agentName, 0)
+
+    def stats(self):
+        """
+        Return sent, dropped and queued message counts.
+        """
+        with self._lock:
+            return {"sent": self.sent, "dropped": self.dropped, "queued": sum(self.sizes.values())}
+
+    def close(self, finished=False):
+        """
+        Release the bus. The in-process bus keeps nothing outside memory, so there is nothing to do.
+        """
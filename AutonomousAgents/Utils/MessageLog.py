@@ -0,0 +1,407 @@
+import os
+import sys
+import json
+import mmap
+import time
+import zlib
+import struct
+import shutil
+import hashlib
+import threading
+import logging
+from collections import Counter
+from dotenv import load_dotenv
+from Utils.MessageBus import MessageBus
+from Utils.Messages import Message
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+HEADER  = struct.Struct("<II")   # payload length, crc32 of the payload
+OFFSETS = "offsets.json"
+END     = "end"
+LOCK    = ".lock"
+
+
+class SegmentLog:
+    """
+    Append-only record log kept in fixed-size, memory-mapped segment files.
+    Each record is a length and checksum header followed by a JSON payload and gets the next offset
+    in the log. Segments are named after their first offset, and a new one is started when the
+    active segment is full. A record torn by a crash fails its checksum and is overwritten by the
+    next append. Consumers commit the offset they have read up to, so a restarted process knows
+    where each of them left off.
+    """
+    def __init__(self, directory, segmentSize=None):
+        self.directory   = directory
+        self.segmentSize = int(os.getenv('BUS_LOG_SEGMENT', '4194304')) if segmentSize is None else segmentSize
+        self.segments    = []   # (baseOffset, path) in offset order
+        self.nextOffset  = 0
+        self.offsets     = {}
+        self._file       = None
+        self._map        = None
+        self._position   = 0
+        self._lock       = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def _open(self):
+        for name in sorted(n for n in os.listdir(self.directory) if n.endswith(".log")):
+            self.segments.append((int(name[:-4]), os.path.join(self.directory, name)))
+        if self.segments:
+            base, path = self.segments[-1]
+            count, position = 0, 0
+            for position, _ in self._records(path):
+                count += 1
+            self.nextOffset = base + count
+            self._mapSegment(path, position)
+        else:
+            self._roll(self.segmentSize)
+        try:
+            with open(os.path.join(self.directory, OFFSETS), 'r', encoding='utf-8') as f:
+                self.offsets = json.load(f)
+        except (OSError, ValueError):
+            self.offsets = {}
+
+    def _records(self, path):
+        """
+        Yield (endPosition, payload) for every intact record of a segment file.
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                position = 0
+                while position + HEADER.size <= size:
+                    length, crc = HEADER.unpack_from(view, position)
+                    start = position + HEADER.size
+                    if length == 0 or start + length > size:
+                        return
+                    payload = view[start:start + length]
+                    if zlib.crc32(payload) != crc:
+                        return
+                    position = start + length
+                    yield position, payload
+
+    def _mapSegment(self, path, position):
+        self._file     = open(path, 'r+b')
+        self._map      = mmap.mmap(self._file.fileno(), 0)
+        self._position = position
+        # Clear whatever a torn write left behind so it can't be mistaken for a record later
+        if self._map[position:position + HEADER.size].strip(b"\0"):
+            self._map[position:] = bytes(len(self._map) - position)
+
+    def _roll(self, size):
+        self._closeSegment()
+        path = os.path.join(self.directory, f"{self.nextOffset:020d}.log")
+        with open(path, 'wb') as f:
+            f.truncate(size)
+        self.segments.append((self.nextOffset, path))
+        self._mapSegment(path, 0)
+
+    def _closeSegment(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+            self._map, self._file = None, None
+
+    def append(self, record):
+        """
+        Append a JSON serializable record and return its offset.
+        """
+        payload = json.dumps(record, default=str).encode("utf-8")
+        size    = HEADER.size + len(payload)
+        with self._lock:
+            if self._position + size > len(self._map):
+                self._roll(max(self.segmentSize, size))
+            self._map[self._position:self._position + size] = HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+            self._position += size
+            offset = self.nextOffset
+            self.nextOffset += 1
+            return offset
+
+    def read(self, fromOffset=0):
+        """
+        Yield (offset, record) for every record from fromOffset on, in the order they were appended.
+        """
+        with self._lock:
+            segments = list(self.segments)
+            end      = self.nextOffset
+        for i, (base, path) in enumerate(segments):
+            following = segments[i + 1][0] if i + 1 < len(segments) else end
+            if following <= fromOffset:
+                continue
+            offset = base
+            for _, payload in self._records(path):
+                if offset >= end:
+                    return
+                if offset >= fromOffset:
+                    yield offset, json.loads(payload)
+                offset += 1
+
+    def commit(self, consumer, offset):
+        """
+        Record that consumer has handled every record up to and including offset.
+        The log is flushed first, so a committed offset never points past what is on disk.
+        """
+        with self._lock:
+            if offset < self.offsets.get(consumer, 0):
+                return
+            self.offsets[consumer] = offset + 1
+            self._map.flush()
+            path = os.path.join(self.directory, OFFSETS)
+            tmp  = path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.offsets, f)
+            os.replace(tmp, path)
+
+    def committed(self, consumer):
+        """
+        Return the first offset consumer has not handled yet.
+        """
+        with self._lock:
+            return self.offsets.get(consumer, 0)
+
+    def close(self):
+        with self._lock:
+            self._closeSegment()
+
+
+def encode(content):
+    if isinstance(content, Message):
+        return {"message": content.toDict()}
+    return {"value": content}
+
+
+def decode(content):
+    if "message" in content:
+        return Message.fromDict(content["message"])
+    return content.get("value")
+
+
+class DurableMessageBus(MessageBus):
+    """
+    MessageBus that writes every send to a SegmentLog before delivering it.
+    Every agent is a consumer of the log and commits its offset when it takes its messages. Opening
+    the bus again on the same directory after a crash restores the run: history() lists what was
+    sent and who had already handled it, and the orchestrator restores finished steps from it.
+    Logged messages are not delivered again, a resumed run sends whatever it still needs afresh.
+    A run closed with finished=True is marked as such and is not resumed by openRunBus.
+    The lock file openRunBus claimed the directory with is released on close.
+    """
+    def __init__(self, directory, segmentSize=None, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.log       = SegmentLog(directory, segmentSize)
+        self.finished  = False
+        self.lockPath  = None
+        self._previous = []
+        self._handled  = dict(self.log.offsets)
+        for offset, record in self.log.read():
+            if record.get("type") == END:
+                self.finished = True
+                continue
+            self._previous.append((offset, record))
+
+    def _stamp(self, fromAgent, toAgent, recipients, content):
+        return self.log.append({
+            "type":       "message",
+            "time":       time.time(),
+            "from":       fromAgent,
+            "to":         toAgent,
+            "recipients": list(recipients),
+            "content":    encode(content),
+        })
+
+    def _take(self, agentName, allowedFrom=None):
+        entries = super()._take(agentName, allowedFrom)
+        if entries:
+            # Only commit below the oldest message still queued, allowedFrom may have skipped some
+            with self._lock:
+                queued = [queue[0][0] for queue in self.mailboxes.get(agentName, {}).values() if queue]
+            self.log.commit(agentName, min(queued) - 1 if queued else entries[-1][0])
+        return entries
+
+    def record(self, fromAgent, content):
+        """
+        Log content without delivering it to anyone, for state kept outside the bus that a resumed
+        run should get back through history().
+        """
+        with self._lock:
+            return self._stamp(fromAgent, None, [], content)
+
+    def history(self):
+        """
+        Return the messages logged before this bus was opened, oldest first. Each one is a dict with
+        offset, time, from, to, content and handledBy, the recipients that had already taken it.
+        """
+        return [
+            {
+                "offset":    offset,
+                "time":      record["time"],
+                "from":      record["from"],
+                "to":        record["to"],
+                "content":   decode(record["content"]),
+                "handledBy": [name for name in record["recipients"] if offset < self._handled.get(name, 0)],
+            }
+            for offset, record in self._previous
+        ]
+
+    def close(self, finished=False):
+        """
+        Flush and close the log. finished=True marks the run as complete.
+        """
+        if finished:
+            self.log.append({"type": END, "time": time.time()})
+            self.finished = True
+        self.log.close()
+        if self.lockPath:
+            releaseDirectory(self.lockPath)
+            self.lockPath = None
+
+
+def runKey(steps):
+    """
+    Return a stable key for a plan, so a rerun of the same steps finds the log of the earlier attempt.
+    """
+    return hashlib.sha256(json.dumps(steps, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def _lockAlive(lockPath):
+    try:
+        with open(lockPath, 'r', encoding='utf-8') as f:
+            pid = int(f.read())
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError):
+        return True   # Still being written by its owner
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def claimDirectory(directory):
+    """
+    Claim a run directory with an exclusive lock file next to it, so two runs never write the same log.
+    A lock left behind by a process that no longer exists is taken over. Returns the lock path, or
+    None if a live run holds the directory.
+    """
+    lockPath = directory + LOCK
+    os.makedirs(os.path.dirname(lockPath) or ".", exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(lockPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if _lockAlive(lockPath):
+                return None
+            releaseDirectory(lockPath)
+            continue
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(str(os.getpid()))
+        return lockPath
+    return None
+
+
+def releaseDirectory(lockPath):
+    try:
+        os.unlink(lockPath)
+    except FileNotFoundError:
+        pass
+
+
+def pruneArchives(directory, keep=None):
+    """
+    Delete all but the newest keep (BUS_LOG_KEEP) directory.<timestamp> logs of a plan.
+    Logs still claimed by a live run are left alone.
+    """
+    keep   = int(os.getenv('BUS_LOG_KEEP', '5')) if keep is None else keep
+    parent = os.path.dirname(directory) or "."
+    prefix = os.path.basename(directory) + "."
+    archives = sorted(
+        (int(name[len(prefix):]), os.path.join(parent, name))
+        for name in os.listdir(parent)
+        if name.startswith(prefix) and name[len(prefix):].isdigit() and os.path.isdir(os.path.join(parent, name))
+    )
+    idle = [path for _, path in archives if not _lockAlive(path + LOCK)]
+    for path in idle[:max(0, len(idle) - keep)]:
+        shutil.rmtree(path, ignore_errors=True)
+        releaseDirectory(path + LOCK)
+        logger.info(f"Pruned the old run log {path}.")
+
+
+def _timestamped(directory):
+    stamp = int(time.time() * 1000)
+    while os.path.exists(f"{directory}.{stamp}"):
+        stamp += 1
+    return f"{directory}.{stamp}"
+
+
+def openRunBus(directory, **kwargs):
+    """
+    Open the durable bus for a run. An unfinished log in directory is resumed, a finished one is
+    moved aside to directory.<timestamp> for replay and a fresh log is started. If another run of
+    the same plan holds directory, this one logs to a directory.<timestamp> of its own instead.
+    Only the newest BUS_LOG_KEEP of those timestamped logs are kept.
+    """
+    lockPath = claimDirectory(directory)
+    if lockPath is None:
+        while lockPath is None:
+            own      = _timestamped(directory)
+            lockPath = claimDirectory(own)
+        logger.info(f"{directory} is in use by another run, logging to {own}.")
+        bus = DurableMessageBus(own, **kwargs)
+        bus.lockPath = lockPath
+        return bus
+    bus = DurableMessageBus(directory, **kwargs)
+    if bus.finished:
+        bus.log.close()
+        archive = _timestamped(directory)
+        os.replace(directory, archive)
+        logger.info(f"Archived the finished run log to {archive}.")
+        pruneArchives(directory)
+        bus = DurableMessageBus(directory, **kwargs)
+    bus.lockPath = lockPath
+    return bus
+
+
+def replay(directory):
+    """
+    Yield the logged messages of a run in the order they were sent, each as a dict with offset,
+    time, from, to and content. Feeding them to a fresh bus reproduces the run's traffic exactly.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"No run log at {directory}.")
+    log = SegmentLog(directory)
+    try:
+        for offset, record in log.read():
+            if record.get("type") == END:
+                continue
+            yield {
+                "offset":  offset,
+                "time":    record["time"],
+                "from":    record["from"],
+                "to":      record["to"],
+                "content": decode(record["content"]),
+            }
+    finally:
+        log.close()
+
+
+if __name__ == "__main__":
+    # Print the timeline of a logged run: python -m Utils.MessageLog <runDirectory>
+    start, kinds, senders = None, Counter(), Counter()
+    for entry in replay(sys.argv[1]):
+        start = entry["time"] if start is None else start
+        kind  = getattr(entry["content"], "kind", type(entry["content"]).__name__)
+        kinds[kind] += 1
+        senders[entry["from"]] += 1
+        print(f"{(entry['time'] - start) * 1000:>10.1f}ms  #{entry['offset']:<5} {entry['from']} -> {entry['to'] or '*'}  {kind}")
+    print(f"\nBy kind:   {dict(kinds)}")
+    print(f"By sender: {dict(senders)}")
@@ -0,0 +1,38 @@
+import uuid
+
+# Message kinds exchanged between sub-agents and workers
+DONE = "done"   # payload: the finished task, its result and whether it failed, as logged for resumed runs
+TASK = "task"   # payload: the task a worker process should run and the dependency results it needs, answered with DONE
+
+
+class Message:
+    """
+    Typed envelope for agent messages.
+    Agents dispatch on kind with a dictionary lookup and read the payload as structured data,
+    so nothing is formatted into text and parsed back. A reply keeps the correlationId of the
+    message it answers, which ties requests and responses together.
+    """
+    __slots__ = ("kind", "sender", "recipient", "payload", "correlationId")
+
+    def __init__(self, kind, sender, recipient=None, payload=None, correlationId=None):
+        self.kind          = kind
+        self.sender        = sender
+        self.recipient     = recipient
+        self.payload       = payload if payload is not None else {}
+        self.correlationId = correlationId or uuid.uuid4().hex
+
+    def reply(self, sender, kind, payload=None):
+        """
+        Build a reply to this message from sender, addressed to this message's sender.
+        """
+        return Message(kind, sender, self.sender, payload, self.correlationId)
+
+    def toDict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def fromDict(cls, data):
+        return cls(**{slot: data.get(slot) for slot in cls.__slots__})
+
+    def __repr__(self):
+        return f"{self.kind} from {self.sender}: {self.payload}"
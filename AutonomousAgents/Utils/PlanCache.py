@@ -0,0 +1,87 @@
+import os
+import re
+import threading
+import logging
+from dotenv import load_dotenv
+from Utils.SkillGraph import SkillGraph
+from Utils.ResponseCache import ResponseCache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class PlanCache:
+    """
+    Cache of decomposed plans keyed by a normalized goal and a hash of the current skill catalog.
+    A hit skips the planning round trip entirely. The cache is cleared automatically when
+    SkillGraph.reloadSkills changes the catalog. It is off unless PLAN_CACHE=True.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(PlanCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, 'initialized', False):
+            return
+        self._initComponents()
+        self.initialized = True
+
+    def _initComponents(self):
+        self.enabled    = os.getenv('PLAN_CACHE', 'False') == 'True'
+        self.skillGraph = SkillGraph()
+        self.cache      = ResponseCache(
+            maxSize=int(os.getenv('PLAN_CACHE_SIZE', '256')),
+            ttl=int(os.getenv('PLAN_CACHE_TTL', '86400')),
+            dbPath=os.getenv('PLAN_CACHE_DB') or None,
+        )
+        self.catalog    = self.skillGraph.catalogHash()
+        self.skillGraph.addReloadListener(self.invalidate)
+
+    def normalizeGoal(self, goal):
+        """
+        Normalize a clarified goal so trivially different phrasings share one cache entry.
+        Lowercases, drops surrounding quotes and trailing punctuation, and collapses whitespace.
+        """
+        goal = str(goal).strip().lower().strip('"\'`')
+        goal = re.sub(r"\s+", " ", goal)
+        return goal.rstrip(" .!?")
+
+    def _key(self, goal, namespace):
+        return self.cache.makeKey(namespace, self.catalog, self.normalizeGoal(goal))
+
+    def get(self, goal, namespace="default"):
+        """
+        Return the cached plan for goal, or None on a miss.
+        The namespace keeps plans from different planners (prompts, tool sets) apart.
+        """
+        if not self.enabled:
+            return None
+        return self.cache.get(self._key(goal, namespace))
+
+    def set(self, goal, plan, namespace="default"):
+        """
+        Store a plan for goal. Empty plans are not cached.
+        """
+        if self.enabled and plan:
+            self.cache.set(self._key(goal, namespace), plan)
+
+    def invalidate(self):
+        """
+        Drop every cached plan and pick up the new catalog hash.
+        """
+        self.catalog = self.skillGraph.catalogHash()
+        self.cache.clear()
+        logger.info("Skill catalog changed, plan cache cleared.")
+
+    def stats(self):
+        """
+        Return hit/miss counters for the plan cache.
+        """
+        return self.cache.stats()
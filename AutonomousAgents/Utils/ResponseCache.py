@@ -0,0 +1,130 @@
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and an optional SQLite store.
+    Entries live in memory first; when a dbPath is given they are also written to disk
+    so they survive restarts. Values must be JSON serializable to be persisted.
+    """
+    def __init__(self, maxSize=512, ttl=3600, dbPath=None):
+        self.maxSize = maxSize
+        self.ttl     = ttl
+        self.dbPath  = dbPath
+        self.hits    = 0
+        self.misses  = 0
+        self._lock   = threading.Lock()
+        self._store  = OrderedDict()
+        self._db     = None
+        if dbPath:
+            self._initDb()
+
+    def _initDb(self):
+        try:
+            self._db = sqlite3.connect(self.dbPath, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)"
+            )
+            self._db.commit()
+        except sqlite3.Error:
+            logger.error(f"Could not open response cache database at {self.dbPath}:", exc_info=True)
+            self._db = None
+
+    @staticmethod
+    def makeKey(*parts):
+        """
+        Build a stable cache key from any number of parts.
+        """
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for key, or default if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > now:
+                    self._store.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._store[key]
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+                    if row and (row[1] is None or row[1] > now):
+                        value = json.loads(row[0])
+                        self._remember(key, value, row[1])
+                        self.hits += 1
+                        return value
+                    if row:
+                        self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                        self._db.commit()
+                except (sqlite3.Error, ValueError) as e:
+                    # A locked or broken store is just a miss, the memory tier keeps working
+                    logger.warning(f"Response cache database read failed, treating {key} as a miss: {e}")
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value under key. A ttl of 0 or None on the cache means the entry never expires.
+        """
+        ttl     = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl else None
+        with self._lock:
+            self._remember(key, value, expires)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), expires)
+                    )
+                    self._db.commit()
+                except (TypeError, ValueError):
+                    logger.warning(f"Response cache value for {key} is not JSON serializable, kept in memory only.")
+                except sqlite3.Error as e:
+                    logger.warning(f"Response cache database write failed, {key} kept in memory only: {e}")
+
+    def _remember(self, key, value, expires):
+        self._store[key] = (value, expires)
+        self._store.move_to_end(key)
+        while self.maxSize and len(self._store) > self.maxSize:
+            self._store.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop every entry from memory and from the SQLite store.
+        """
+        with self._lock:
+            self._store.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM cache")
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Response cache database could not be cleared: {e}")
+
+    def stats(self):
+        """
+        Return hit/miss counters and the current hit rate.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits":    self.hits,
+                "misses":  self.misses,
+                "size":    len(self._store),
+                "hitRate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,94 @@
+import os
+import re
+import threading
+from dotenv import load_dotenv
+from Utils.Results import notReady
+
+load_dotenv()
+
+# Result lines the formatter knows how to show as they are: readings like "Current humidity: 40%"
+# and app actions like "Opened Spotify"
+READABLE_LINES = (
+    re.compile(r"^[A-Z][\w ]*: \S.*$"),
+    re.compile(r"^(Opened|Closed) \S.*$"),
+)
+
+# Bare values that only need a sentence around them
+TEMPLATES = (
+    (re.compile(r"^\d{1,2}:\d{2}$"),            "It's {}."),
+    (re.compile(r"^\d{1,2}-[A-Za-z]+-\d{4}$"),   "Today is {}."),
+)
+
+
+class ResultFormatter:
+    """
+    Rule layer in front of the final summarization call.
+    Direct answers are returned as-is. A single-step result is only returned without a summary
+    when every line of it is in a shape the formatter recognizes (READABLE_LINES) or it is a bare
+    time or date that a template turns into a sentence. Anything else, like a bare number or a
+    JSON blob, still goes to the LLM.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(ResultFormatter, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, 'initialized', False):
+            return
+        self._initComponents()
+        self.initialized = True
+
+    def _initComponents(self):
+        self.enabled    = os.getenv('SKIP_SUMMARY', 'True') == 'True'
+        self.skipped    = 0
+        self.summarized = 0
+        self._counterLock = threading.Lock()
+
+    def format(self, results):
+        """
+        Return a user-ready answer for results, or None if the results still need an LLM summary.
+        """
+        answer = self._format(results) if self.enabled else None
+        with self._counterLock:
+            if answer is None:
+                self.summarized += 1
+            else:
+                self.skipped += 1
+        return answer
+
+    def _format(self, results):
+        if len(results) != 1:
+            return None
+        result = results[0]
+        if "error" in result or not isinstance(result.get("result"), str):
+            return None
+        text = result["result"].strip()
+        if result.get("step") == "direct_answer":
+            return text or None
+        for pattern, template in TEMPLATES:
+            if pattern.match(text):
+                return template.format(text)
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines or notReady(text):
+            return None
+        if all(any(pattern.match(line) for pattern in READABLE_LINES) for line in lines):
+            return text
+        return None
+
+    def stats(self):
+        """
+        Return how often the summarization call was skipped.
+        """
+        with self._counterLock:
+            total = self.skipped + self.summarized
+            return {
+                "skipped":    self.skipped,
+                "summarized": self.summarized,
+                "skipRate":   self.skipped / total if total else 0.0,
+            }
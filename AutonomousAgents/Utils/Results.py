@@ -0,0 +1,15 @@
+# Result lines that report a failure or a missing value instead of an actual result
+NOT_READY_PREFIXES = (
+    "No action result",
+    "Step failed",
+    "Could not fetch",
+    "Error",
+    "An error occurred",
+)
+
+
+def notReady(text):
+    """
+    Check if any line of a result reports a failure, e.g. a weather reading with one value missing.
+    """
+    return any(line.strip().startswith(NOT_READY_PREFIXES) for line in str(text).splitlines())
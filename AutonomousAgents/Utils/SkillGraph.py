@@ -1,19 +1,32 @@
 
 import json
 import re
+import ast
+import hashlib
 import inspect
 import os
+import sys
+import importlib.util
 import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait as waitFutures
 from dotenv import load_dotenv
 from pathlib import Path
 from google.genai import types
 from HoloAI import HoloLink
+from Utils.ToolManifest import ToolManifest
+from Utils.ToolResolver import ToolResolver
+from Utils.LazyLoader import LazyTools
+from Utils.SkillWatcher import SkillWatcher
+from Utils.ResponseCache import ResponseCache
+from Utils.Results import notReady
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+CACHE_MISS = object()
+
 
 class SkillGraph:
     _instance = None
@@ -37,9 +50,23 @@ class SkillGraph:
         self.baseSkillsDir    = self.getDir('Skills')
         self.showCapabilities = os.getenv('SHOW_CAPABILITIES', 'False') == 'True'
         self.showMetaData     = os.getenv('SHOW_METADATA', 'False') == 'True'
+        self.reloadListeners  = []
+        self.lazyTools        = LazyTools(self.getDir('Tools')) if os.getenv('LAZY_TOOLS', 'False') == 'True' else None
+        self.registryVersion  = 0
+        self._registryLock    = threading.Lock()
+        self.toolManifest     = ToolManifest()
+        self.toolResolvers    = {}
+        self.parallelActions  = os.getenv('PARALLEL_ACTIONS', 'True') == 'True'
+        self.actionWorkers    = int(os.getenv('MAX_ACTION_WORKERS', '8'))
+        self.actionTimeout    = float(os.getenv('ACTION_TIMEOUT', '30'))
+        self._actionExecutor  = None
+        self.resultCaching    = os.getenv('RESULT_CACHE', 'True') == 'True'
+        self.resultCache      = ResponseCache(maxSize=int(os.getenv('RESULT_CACHE_SIZE', '1024')))
         self.loadAllComponents()
-        if self.showCapabilities:
-            self.getAgentSkills()
+        self.registry         = self._buildRegistry()
+        self.skillWatcher     = None
+        if os.getenv('WATCH_SKILLS', 'False') == 'True':
+            self.watchSkills()
         if self.showMetaData:
             self.getMetaData()
 
@@ -51,10 +78,21 @@ class SkillGraph:
         Load all components from the specified directories.
         This method loads skills and tools from the 'Skills' directory.
         It also loads custom tools for the agent.
+        With LAZY_TOOLS enabled only the skills are imported here, tools are read as metadata
+        and imported on their first call.
         """
         self.agentSkills = []
         self.agentTools  = []
 
+        if self.lazyTools:
+            self.holoLink.loadComponents(
+                paths=[['Skills']],
+                components=[self.agentSkills],
+                reloadable=[False],
+            )
+            self.lazyTools.scan()
+            return
+
         self.holoLink.loadComponents(
             paths=[
                 ['Skills'],
@@ -66,31 +104,223 @@ class SkillGraph:
             ],
             reloadable=[
                 False, # If you want to be able to auto reload skills during runtime, set this to True automatically checks every 60 seconds
-                False,
+                False, # or set WATCH_SKILLS=True to reload on file changes instead (see watchSkills)
             ],
             #cycleInterval=60 ## only needed if reloadable is True and you want to change the default of 60 seconds
         )
 
+    # ----- Registry -----
+    def _buildRegistry(self):
+        """
+        Build the registry of everything derived from the loaded skills and tools.
+        Actions, capabilities and instructions are built up front, json and typed tool schemas
+        are filled in the first time they are asked for.
+        """
+        actions      = self.holoLink.getComponents(self.agentSkills)
+        capabilities = self.holoLink.getCapabilities(self.agentSkills, self.showCapabilities, False)
+        tools        = self.lazyTools.tools() if self.lazyTools else self.holoLink.getTools(self.agentTools)
+        toolNames    = sorted(tools)
+        catalog      = json.dumps([sorted(actions), toolNames])
+        return {
+            "version":      self.registryVersion,
+            "actions":      actions,
+            "capabilities": capabilities,
+            "instructions": self.holoLink.skillInstructions(capabilities),
+            "tools":        tools,
+            "catalog":      hashlib.sha256(catalog.encode('utf-8')).hexdigest(),
+            "policies":     self._skillPolicies(),
+            "jsonTools":    {},
+            "typedTools":   None,
+        }
+
+    def _skillPolicies(self):
+        """
+        Map every skill entry point to its execution policy: whether it can run concurrently with
+        other actions ("threadSafe") and how long its results can be reused ("cacheTTL").
+        Skill classes declare both in _metaData, function skills with the cachePolicy decorator.
+        Anything that doesn't declare them runs serially and is never cached.
+        """
+        def policy(get):
+            return {"threadSafe": bool(get('threadSafe', False)), "cacheTTL": get('cacheTTL', None)}
+
+        policies = {}
+        for component in self.agentSkills:
+            if inspect.isfunction(component) or inspect.ismethod(component):
+                policies[component.__name__] = policy(lambda key, default: getattr(component, key, default))
+            elif inspect.ismodule(component):
+                for name, func in inspect.getmembers(component, inspect.isfunction):
+                    policies[name] = policy(lambda key, default: getattr(func, key, default))
+            else:
+                metaData = component._metaData() if hasattr(component, '_metaData') else {}
+                for name, _ in inspect.getmembers(type(component), inspect.isfunction):
+                    if not name.startswith('_'):
+                        policies[name] = policy(metaData.get)
+        return policies
+
+    def refreshRegistry(self):
+        """
+        Rebuild the registry and bump its version.
+        The new registry is built aside and swapped in with a single assignment, so readers
+        always see either the old or the new registry, never a half built one.
+        """
+        with self._registryLock:
+            self.registryVersion += 1
+            self.registry = self._buildRegistry()
+            self.toolResolvers = {}
+        return self.registryVersion
+
     def getAgentActions(self):
         """
         Get self actions based on the skills available.
         This method combines dynamic, static, and restricted self skills.
         """
-        skills = (
-            self.agentSkills
-        )
-        return self.holoLink.getComponents(skills)
+        return self.registry["actions"]
 
     def reloadSkills(self):
         """
         Reload all skills and print any new skills added.
+        The registry is rebuilt and reload listeners are notified when the skill or tool catalog changed.
         """
         original = self.getMetaData()
+        originalCatalog = self.catalogHash()
         self.holoLink.reloadSkills()
+        if self.lazyTools:
+            self.lazyTools.scan()
+        self.toolManifest.invalidate()
+        self.refreshRegistry()
         new = self.getMetaData()
         for skill in new:
             if skill not in original:
                 print(f"I've added the new skill {skill['className']} That {skill['description']}.\n")
+        self._notifyReload(originalCatalog)
+
+    def reloadChanged(self, paths):
+        """
+        Reload after the given files changed.
+        Lazy tool files are only reparsed. Every other file is imported again from disk and what it
+        defines replaces its old components, since HoloLink.reloadSkills only reloads components
+        registered as reloadable.
+        """
+        paths = [Path(p).resolve() for p in paths]
+        lazyPaths = [path for path in paths if self.lazyTools and path.parent == self.lazyTools.directory]
+        originalCatalog = self.catalogHash()
+        if lazyPaths:
+            self.lazyTools.scan(lazyPaths)
+        self._reloadModules([path for path in paths if path not in lazyPaths])
+        self.toolManifest.invalidate()
+        self.refreshRegistry()
+        logger.info(f"Reloaded {', '.join(path.name for path in paths)} (registry version {self.registryVersion}).")
+        self._notifyReload(originalCatalog)
+
+    def _reloadModules(self, paths):
+        """
+        Import the changed files again and replace the components they define.
+        Modules are imported and the new lists built aside, then sys.modules and the component
+        lists are swapped under the registry lock, so a registry build never sees them half updated.
+        """
+        toolsDir = Path(self.getDir('Tools')).resolve()
+        skills, tools = list(self.agentSkills), list(self.agentTools)
+        modules = {}
+        for path in paths:
+            components = tools if toolsDir in path.parents else skills
+            old = [c for c in components if self._componentFile(c) == path]
+            module = None
+            if path.exists():
+                name = next((self._moduleName(c) for c in old), None) or path.stem
+                try:
+                    module = self._importFile(path, name)
+                except Exception:
+                    logger.error(f"Could not import {path}, keeping its previous version:", exc_info=True)
+                    continue
+                modules[name] = module
+            fresh = {}
+            replaced = [self._replacement(c, module, fresh) for c in old] if old else self._moduleComponents(module)
+            components[:] = [c for c in components if c not in old] + [c for c in replaced if c is not None]
+        with self._registryLock:
+            sys.modules.update(modules)
+            self.agentSkills[:] = skills
+            self.agentTools[:]  = tools
+
+    @staticmethod
+    def _importFile(path, name):
+        spec   = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    @staticmethod
+    def _componentFile(component):
+        target = component.__func__ if inspect.ismethod(component) else component
+        if not (inspect.ismodule(target) or inspect.isfunction(target) or inspect.isclass(target)):
+            target = type(target)
+        try:
+            return Path(inspect.getsourcefile(target)).resolve()
+        except (TypeError, OSError):
+            return None
+
+    @staticmethod
+    def _moduleName(component):
+        if inspect.ismodule(component):
+            return component.__name__
+        return getattr(component, '__module__', None) or type(component).__module__
+
+    def _replacement(self, component, module, fresh):
+        """
+        Return the counterpart of an old component in the re-imported module, or None if it is gone.
+        fresh maps old instances to their new ones, so methods of one instance share its replacement.
+        """
+        if module is None:
+            return None
+        if inspect.ismodule(component):
+            return module
+        if inspect.ismethod(component):
+            owner = self._replacement(component.__self__, module, fresh)
+            return getattr(owner, component.__name__, None) if owner is not None else None
+        if inspect.isfunction(component) or inspect.isclass(component):
+            return getattr(module, component.__name__, None)
+        if id(component) not in fresh:
+            cls = getattr(module, type(component).__name__, None)
+            fresh[id(component)] = cls() if cls is not None else None
+        return fresh[id(component)]
+
+    @staticmethod
+    def _moduleComponents(module):
+        """
+        Components of a newly added file: instances of its skill classes (those with _metaData),
+        or its public functions when it has none.
+        """
+        if module is None:
+            return []
+        defined = [obj for _, obj in inspect.getmembers(module) if getattr(obj, '__module__', None) == module.__name__]
+        skills  = [obj() for obj in defined if inspect.isclass(obj) and hasattr(obj, '_metaData')]
+        return skills or [obj for obj in defined if inspect.isfunction(obj) and not obj.__name__.startswith('_')]
+
+    def watchSkills(self, debounce=0.2):
+        """
+        Start an inotify watcher on the Skills and Tools directories that calls reloadChanged on every change.
+        Returns False if inotify is not available.
+        """
+        if self.skillWatcher is None:
+            self.skillWatcher = SkillWatcher([self.getDir('Skills'), self.getDir('Tools')], self.reloadChanged, debounce)
+        return self.skillWatcher.start()
+
+    def _notifyReload(self, originalCatalog):
+        if self.catalogHash() != originalCatalog:
+            for listener in list(self.reloadListeners):
+                listener()
+
+    def addReloadListener(self, listener):
+        """
+        Register a callable that is invoked with no arguments whenever reloadSkills changes the catalog.
+        """
+        self.reloadListeners.append(listener)
+
+    def catalogHash(self):
+        """
+        Get a hash of the current skill actions and tool names.
+        Anything derived from the catalog, like cached plans, can be keyed on it.
+        """
+        return self.registry["catalog"]
 
     def getMetaData(self):
         """Get metadata for all skills."""
@@ -105,11 +335,7 @@ class SkillGraph:
         Get the capabilities of the agent based on its skills.
         This method retrieves the capabilities of the agent's skills and returns them in a structured format.
         """
-        description = False
-        capabitites = (
-            self.agentSkills
-        )
-        return self.holoLink.getCapabilities(capabitites, self.showCapabilities, description)
+        return self.registry["capabilities"]
 
     def checkActions(self, action: str) -> str:
         """
@@ -137,14 +363,116 @@ class SkillGraph:
         """
         Execute both single and multiple actions based on the provided actions and action string.
         The for loop is handled internally, so you can pass a single action or a list of actions.
+        Results of skills that declare a cacheTTL are reused for identical actions within that time.
+        With PARALLEL_ACTIONS enabled, a list of actions runs thread-safe skills concurrently on a
+        bounded pool (MAX_ACTION_WORKERS) with one timeout for the whole batch (ACTION_TIMEOUT), while other
+        skills run one after another. Results are always returned in the order of the actions.
+        """
+        if isinstance(action, str):
+            return self.holoLink.actionParser.executeActions(actions, action)
+        policies = self.registry["policies"]
+        results  = [None] * len(action)
+        pending  = []
+        for i, a in enumerate(action):
+            ttl = policies.get(self.actionName(a), {}).get("cacheTTL")
+            key = self._cacheKey("action", *self.canonicalAction(a)) if self._cacheable(ttl) else None
+            hit = self.resultCache.get(key, CACHE_MISS) if key else CACHE_MISS
+            if hit is CACHE_MISS:
+                pending.append((i, key, ttl))
+            else:
+                results[i] = hit
+        if pending:
+            executed = self._runActions(actions, [action[i] for i, _, _ in pending])
+            for (i, key, ttl), result in zip(pending, executed):
+                results[i] = result
+                if key:
+                    self._remember(key, result, ttl)
+        return results
+
+    def _runActions(self, actions, action):
+        if not self.parallelActions or len(action) < 2:
+            return self.holoLink.actionParser.executeActions(actions, action)
+        policies = self.registry["policies"]
+        safe     = [i for i, a in enumerate(action) if policies.get(self.actionName(a), {}).get("threadSafe", False)]
+        if len(safe) < 2:
+            return self.holoLink.actionParser.executeActions(actions, action)
+        results = [None] * len(action)
+        pool    = self._getActionExecutor()
+        futures = {i: pool.submit(self.executeAction, actions, action[i]) for i in safe}
+        for i, a in enumerate(action):
+            if i not in futures:
+                results[i] = self.executeAction(actions, a)
+        # One deadline for the whole batch, started once the inline actions are done so their
+        # run time isn't charged to the pooled ones, and several hung actions don't add up their timeouts
+        _, pending = waitFutures(futures.values(), timeout=self.actionTimeout)
+        for i, future in futures.items():
+            if future in pending:
+                if future.cancel():
+                    logger.warning(f"Action {action[i]} timed out after {self.actionTimeout:g}s before it started.")
+                else:
+                    logger.warning(f"Action {action[i]} timed out after {self.actionTimeout:g}s and is still running, "
+                                   f"its worker stays busy until it returns.")
+                results[i] = f"Error: action {action[i]} timed out after {self.actionTimeout:g} seconds."
+                continue
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                logger.error(f"Action {action[i]} failed:", exc_info=True)
+                results[i] = f"An error occurred while executing {action[i]}: {e}"
+        return results
+
+    def actionName(self, action):
+        """
+        Return the skill name an action string calls, e.g. weatherSkill for "weatherSkill('get-weather', 1, 2)".
+        """
+        match = re.match(r"\s*([A-Za-z_]\w*)\s*\(", str(action))
+        return match.group(1) if match else None
+
+    def canonicalAction(self, action):
+        """
+        Return (skill name, args) for an action string so that formatting differences like spacing
+        or quote style map to the same cache entry. Unparseable actions fall back to the stripped text.
+        """
+        try:
+            call = ast.parse(str(action).strip(), mode='eval').body
+            if isinstance(call, ast.Call) and isinstance(call.func, ast.Name):
+                args   = [ast.literal_eval(arg) for arg in call.args]
+                kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+                return call.func.id, args, kwargs
+        except (ValueError, TypeError, SyntaxError):
+            pass
+        return self.actionName(action), str(action).strip()
+
+    def _cacheable(self, ttl):
+        return self.resultCaching and isinstance(ttl, (int, float)) and ttl > 0
+
+    def _cacheKey(self, *parts):
+        return self.resultCache.makeKey(*parts)
+
+    def _remember(self, key, result, ttl):
+        # Every line is checked, so a partly failed result like a weather reading missing its humidity isn't kept
+        if result is None or (isinstance(result, str) and notReady(result)):
+            return
+        self.resultCache.set(key, result, ttl)
+
+    def resultCacheStats(self):
+        """
+        Return hit/miss counters for the shared skill and tool result cache.
         """
-        return self.holoLink.actionParser.executeActions(actions, action)
+        return self.resultCache.stats()
+
+    def _getActionExecutor(self):
+        if self._actionExecutor is None:
+            with self._registryLock:
+                if self._actionExecutor is None:
+                    self._actionExecutor = ThreadPoolExecutor(max_workers=self.actionWorkers, thread_name_prefix="Action")
+        return self._actionExecutor
 
     def skillInstructions(self):
         """
         Get skill instructions for the agent based on its capabilities.
         """
-        return self.holoLink.skillInstructions(self.getAgentSkills())
+        return self.registry["instructions"]
 
 
     # ----- Tools -----
@@ -153,17 +481,42 @@ class SkillGraph:
         Execute a tool with the given name, tools, and arguments.
         If the tool is not found, it will return an error message.
         If the tool execution fails, it will retry based on the retry parameter.
-        """
-        return self.holoLink.actionParser.executeTool(name, tools, args, threshold, retry)
+        Misspelled names are resolved through an indexed ToolResolver before the call.
+        Tools decorated with cachePolicy(ttl) reuse their result for identical arguments within ttl seconds.
+        """
+        resolved = self.resolveTool(name, tools, threshold)
+        if resolved is None:
+            return f"Error: Tool '{name}' not found."
+        ttl      = getattr(tools.get(resolved), 'cacheTTL', None) if isinstance(tools, dict) else None
+        key      = self._cacheKey("tool", resolved, args) if self._cacheable(ttl) else None
+        if key:
+            hit = self.resultCache.get(key, CACHE_MISS)
+            if hit is not CACHE_MISS:
+                return hit
+        result = self.holoLink.actionParser.executeTool(resolved, tools, args, threshold, retry)
+        if key:
+            self._remember(key, result, ttl)
+        return result
+
+    def resolveTool(self, name, tools, threshold=80):
+        """
+        Resolve a model emitted tool name to a name in tools, or None if nothing is close enough.
+        Resolvers are keyed by the catalog hash and the tool count, and rebuilt if the names differ.
+        """
+        key   = (self.catalogHash(), len(tools))
+        entry = self.toolResolvers.get(key)
+        if entry is None or (entry[0] is not tools and entry[1].exact != set(tools)):
+            if len(self.toolResolvers) >= 32:
+                self.toolResolvers.clear()
+            entry = (tools, ToolResolver(tools))
+            self.toolResolvers[key] = entry
+        return entry[1].resolve(name, threshold)
 
     def getTools(self):
         """
         Get all tools available for the agent.
         """
-        tools = (
-            self.agentTools
-        )
-        return self.holoLink.getTools(tools)
+        return self.registry["tools"]
 
     def extractJson(self, text):
         """
@@ -196,8 +549,15 @@ class SkillGraph:
         The schemaType can be either 'chat_completions' or 'responses'.
         Returns a dictionary representing the tools in JSON schema format.
         """
-        toolList = self.getTools()
-        return self.holoLink.getJsonTools(toolList, schemaType)
+        registry = self.registry
+        jsonTools = registry["jsonTools"].get(schemaType)
+        if jsonTools is None:
+            with self._registryLock:
+                jsonTools = registry["jsonTools"].get(schemaType)
+                if jsonTools is None:
+                    jsonTools = self._compileJsonTools(registry["tools"], schemaType)
+                    registry["jsonTools"][schemaType] = jsonTools
+        return jsonTools
 
     def getTypedTools(self):
         """
@@ -205,8 +565,44 @@ class SkillGraph:
         This method retrieves the tools and converts them to a format compatible with Google GenAI APIs.
         Returns a dictionary representing the tools in typed format.
         """
-        toolList = self.getTools()
-        return self.holoLink.getTypedTools(toolList)
+        registry = self.registry
+        if registry["typedTools"] is None:
+            with self._registryLock:
+                if registry["typedTools"] is None:
+                    registry["typedTools"] = self._compileTypedTools(registry["tools"])
+        return registry["typedTools"]
+
+    def _compileJsonTools(self, toolList, schemaType):
+        """
+        Build (schemas, toolFunctions) for the json tools, reading schemas from the tool manifest
+        when the tool's source file is unchanged and introspecting only the ones that changed.
+        """
+        schemas = [
+            self.toolManifest.schema(func, schemaType, lambda f: self.getJsonSchema(f, schemaType))
+            for func in toolList.values()
+        ]
+        self.toolManifest.save()
+        return schemas, self._toolFunctions(toolList)
+
+    def _compileTypedTools(self, toolList):
+        """
+        Build (tools, toolFunctions) for the typed tools from the declarations in the tool manifest.
+        The types.Tool is only built here, the first time typed tools are asked for.
+        """
+        declarations = [
+            self.toolManifest.schema(func, "typed", self.getTypedSchema)
+            for func in toolList.values()
+        ]
+        self.toolManifest.save()
+        declarations = [
+            types.FunctionDeclaration.model_validate(declaration) if isinstance(declaration, dict) else declaration
+            for declaration in declarations
+        ]
+        return [types.Tool(function_declarations=declarations)], self._toolFunctions(toolList)
+
+    def _toolFunctions(self, toolList):
+        # toolList is the {name: callable} dict from HoloLink.getTools or LazyTools.tools
+        return dict(toolList)
 
 
     # ----- Can be used with both skills and tools -----
@@ -0,0 +1,142 @@
+import os
+import sys
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM  = 0x00000040
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_ISDIR       = 0x40000000
+IN_CLOEXEC     = os.O_CLOEXEC
+WATCH_MASK     = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER   = struct.Struct('iIII')
+
+
+class SkillWatcher:
+    """
+    inotify watcher for the skill and tool directories and their subdirectories.
+    A daemon thread blocks on the inotify descriptor, so nothing runs until a file actually changes.
+    Changes that arrive within the debounce window (an editor saving, a git checkout) are grouped
+    and handed to onChange as one list of changed .py paths.
+    """
+    def __init__(self, directories, onChange, debounce=0.2):
+        self.directories = [Path(d).resolve() for d in directories]
+        self.onChange    = onChange
+        self.debounce    = debounce
+        self.watches     = {}
+        self.reloads     = 0
+        self._fd         = None
+        self._libc       = None
+        self._thread     = None
+        self._stopRead, self._stopWrite = None, None
+
+    @staticmethod
+    def available():
+        """
+        Check if inotify can be used on this platform.
+        """
+        return sys.platform.startswith('linux') and bool(ctypes.util.find_library('c'))
+
+    def start(self):
+        """
+        Start watching. Returns False if inotify is not available or the directories can't be watched.
+        """
+        if self._thread is not None:
+            return True
+        if not self.available():
+            logger.warning("inotify is not available on this platform, skill watching is disabled.")
+            return False
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd   = self._libc.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            logger.warning(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+            self._fd = None
+            return False
+        for directory in self.directories:
+            self._addWatch(directory)
+        if not self.watches:
+            os.close(self._fd)
+            self._fd = None
+            return False
+        self._stopRead, self._stopWrite = os.pipe()
+        self._thread = threading.Thread(target=self._watch, name="SkillWatcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {', '.join(str(d) for d in self.watches.values())} for changes.")
+        return True
+
+    def _addWatch(self, directory):
+        """
+        Watch directory and, since inotify watches are not recursive, every subdirectory below it.
+        """
+        wd = self._libc.inotify_add_watch(self._fd, str(directory).encode(), WATCH_MASK)
+        if wd < 0:
+            logger.warning(f"Could not watch {directory}: {os.strerror(ctypes.get_errno())}")
+            return
+        self.watches[wd] = directory
+        for child in sorted(directory.iterdir()):
+            if child.is_dir() and child.name != '__pycache__' and not child.name.startswith('.'):
+                self._addWatch(child)
+
+    def stop(self):
+        """
+        Stop the watcher thread and release the inotify descriptor.
+        """
+        if self._thread is None:
+            return
+        os.write(self._stopWrite, b'x')
+        self._thread.join()
+        for fd in (self._fd, self._stopRead, self._stopWrite):
+            os.close(fd)
+        self._thread = None
+        self._fd     = None
+
+    def _watch(self):
+        while True:
+            ready, _, _ = select.select([self._fd, self._stopRead], [], [])
+            if self._stopRead in ready:
+                return
+            changed = self._readEvents()
+            # Keep collecting until the directory has been quiet for the debounce window.
+            while True:
+                ready, _, _ = select.select([self._fd, self._stopRead], [], [], self.debounce)
+                if self._stopRead in ready:
+                    return
+                if not ready:
+                    break
+                changed |= self._readEvents()
+            if changed:
+                self._dispatch(sorted(changed))
+
+    def _readEvents(self):
+        changed = set()
+        data    = os.read(self._fd, 64 * 1024)
+        offset  = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            directory = self.watches.get(wd)
+            if directory and mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name != '__pycache__' and not name.startswith('.'):
+                    self._addWatch(directory / name)
+                continue
+            if directory and name.endswith('.py') and not name.startswith(('_', '.')):
+                changed.add(directory / name)
+        return changed
+
+    def _dispatch(self, paths):
+        try:
+            self.onChange(paths)
+            self.reloads += 1
+        except Exception:
+            logger.error(f"Reload after changes to {', '.join(p.name for p in paths)} failed:", exc_info=True)
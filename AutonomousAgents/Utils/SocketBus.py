@@ -0,0 +1,384 @@
+import os
+import json
+import argparse
+import time
+import uuid
+import socket
+import struct
+import threading
+import socketserver
+import logging
+from collections import defaultdict
+from dotenv import load_dotenv
+from Utils.MessageBus import MessageBus, BROADCAST
+from Utils.MessageLog import encode, decode
+from Utils.Messages import TASK, DONE
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+FRAME     = struct.Struct(">I")   # payload length, big endian
+MAX_FRAME = 64 * 1024 * 1024
+
+
+def sendFrame(sock, data):
+    """
+    Write one length-prefixed JSON frame.
+    """
+    payload = json.dumps(data, default=str).encode("utf-8")
+    sock.sendall(FRAME.pack(len(payload)) + payload)
+
+
+def recvFrame(sock):
+    """
+    Read one length-prefixed JSON frame, or return None once the peer has closed the connection.
+    """
+    header = _recvExactly(sock, FRAME.size)
+    if header is None:
+        return None
+    (length,) = FRAME.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME} byte limit.")
+    payload = _recvExactly(sock, length)
+    if payload is None:
+        raise ConnectionError("Connection closed in the middle of a frame.")
+    return json.loads(payload)
+
+
+def _recvExactly(sock, size):
+    chunks, remaining = [], size
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def parseAddress(address):
+    """
+    Return (family, target) for "unix:/path/to.sock", "tcp://host:port" or "host:port".
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix://"):] if address.startswith("unix://") else address[len("unix:"):]
+    if address.startswith("tcp://"):
+        address = address[len("tcp://"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+class BusBroker:
+    """
+    Broker process for SocketBus clients.
+    It owns an ordinary MessageBus (or DurableMessageBus) and serves it over a Unix domain socket or
+    TCP, one thread per connection, so agents in other processes and on other hosts share its
+    mailboxes. Requests and replies are length-prefixed JSON frames.
+    The names each namespace used are indexed, so pending counts for a run only look at its own
+    mailboxes and dropNamespace frees all of them when the run's bus is closed.
+    Run one with: python -m Utils.SocketBus [address]
+    """
+    def __init__(self, address=None, bus=None):
+        self.address  = address or os.getenv('BUS_ADDRESS') or "tcp://127.0.0.1:7878"
+        self.bus      = bus or MessageBus()
+        self.server   = None
+        self._thread  = None
+        self._names   = defaultdict(set)   # namespace -> scoped agent and topic names it used
+        self._lock    = threading.Lock()
+        self._ops     = {
+            "send":        lambda r: self.bus.send(r["from"], r["to"], decode(r["content"])),
+            "publish":     lambda r: self.bus.publish(r["from"], r["topic"], decode(r["content"])),
+            "receive":     lambda r: [self._encodeMessage(m) for m in self.bus.receive(r["agent"], r.get("allowedFrom"), r.get("timeout", 0))],
+            "subscribe":   lambda r: self.bus.subscribe(r["agent"], r["topic"]),
+            "unsubscribe": lambda r: self.bus.unsubscribe(r["agent"], r["topic"]),
+            "pending":       self._pending,
+            "stats":         lambda r: self.bus.stats(),
+            "dropNamespace": self._dropNamespace,
+        }
+
+    def _index(self, request):
+        names = [request.get(field) for field in ("agent", "from", "to", "topic")]
+        with self._lock:
+            for name in names:
+                if isinstance(name, str) and "/" in name:
+                    self._names[name.split("/", 1)[0]].add(name)
+
+    def _pending(self, request):
+        if request.get("agent") or not request.get("namespace"):
+            return self.bus.pending(request.get("agent"))
+        with self._lock:
+            names = list(self._names.get(request["namespace"], ()))
+        return sum(self.bus.pending(name) for name in names)
+
+    def _dropNamespace(self, request):
+        with self._lock:
+            names = self._names.pop(request["namespace"], set())
+        self.bus.forget(names)
+        return len(names)
+
+    def _encodeMessage(self, message):
+        return {"from": message["from"], "to": message["to"], "content": encode(message["content"])}
+
+    def handle(self, request):
+        """
+        Run one request against the bus and return the reply frame.
+        """
+        op = self._ops.get(request.get("op"))
+        if op is None:
+            return {"ok": False, "error": f"Unknown operation {request.get('op')}."}
+        try:
+            self._index(request)
+            return {"ok": True, "result": op(request)}
+        except Exception as e:
+            logger.error(f"Bus request {request.get('op')} failed: {e}", exc_info=True)
+            return {"ok": False, "error": str(e)}
+
+    def _createServer(self):
+        broker = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                while True:
+                    try:
+                        request = recvFrame(self.request)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Dropping bus client: {e}")
+                        return
+                    if request is None:
+                        return
+                    sendFrame(self.request, broker.handle(request))
+
+        family, target = parseAddress(self.address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(target):
+                os.unlink(target)
+            server = socketserver.ThreadingUnixStreamServer(target, Handler)
+        else:
+            socketserver.ThreadingTCPServer.allow_reuse_address = True
+            server = socketserver.ThreadingTCPServer(target, Handler)
+        server.daemon_threads = True
+        return server
+
+    def start(self):
+        """
+        Serve in a background thread and return once the socket is listening.
+        """
+        self.server  = self._createServer()
+        self._thread = threading.Thread(target=self.server.serve_forever, name="BusBroker", daemon=True)
+        self._thread.start()
+        return self
+
+    def serveForever(self):
+        self.server = self._createServer()
+        logger.info(f"Agent bus broker listening on {self.address}.")
+        self.server.serve_forever()
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            family, target = parseAddress(self.address)
+            if family == socket.AF_UNIX and os.path.exists(target):
+                os.unlink(target)
+            self.server = None
+
+
+class SocketBus:
+    """
+    Client for a BusBroker with the same API as MessageBus, so agents can't tell the difference.
+    Every thread gets its own connection, so a sender blocked on a full mailbox never holds up
+    the receivers in the same process. Agent names are scoped by namespace, which keeps the
+    mailboxes of concurrent runs on one broker apart. onSend fires for sends made through this client.
+    Names that already carry a namespace ("workers/Alpha") are used as they are, which is how a run
+    addresses the workers and how a worker replies to the run.
+    The client that owns the namespace (the run's, not a worker's) drops it on the broker when closed.
+    """
+    def __init__(self, address=None, namespace=None, onSend=None, timeout=None, ownsNamespace=True):
+        self.address       = address or os.getenv('BUS_ADDRESS')
+        self.namespace     = namespace or uuid.uuid4().hex[:12]
+        self.timeout       = float(os.getenv('BUS_SOCKET_TIMEOUT', '30')) if timeout is None else timeout
+        self.onSend        = onSend
+        self.ownsNamespace = ownsNamespace
+        self._local        = threading.local()
+        self._sockets      = []
+        self._lock         = threading.Lock()
+
+    def _scoped(self, name):
+        if name is None or "/" in name:
+            return name
+        return f"{self.namespace}/{name}"
+
+    def _unscoped(self, name):
+        prefix = f"{self.namespace}/"
+        return name[len(prefix):] if name and name.startswith(prefix) else name
+
+    def _connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            family, target = parseAddress(self.address)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(target)
+            if family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._local.sock = sock
+            with self._lock:
+                self._sockets.append(sock)
+        return sock
+
+    def _request(self, op, **fields):
+        sock = self._connection()
+        try:
+            sendFrame(sock, dict(fields, op=op))
+            reply = recvFrame(sock)
+        except OSError:
+            self._local.sock = None
+            sock.close()
+            raise
+        if reply is None:
+            self._local.sock = None
+            raise ConnectionError(f"Bus broker at {self.address} closed the connection.")
+        if not reply.get("ok"):
+            raise RuntimeError(f"Bus broker error: {reply.get('error')}")
+        return reply.get("result")
+
+    def subscribe(self, agentName, topic=BROADCAST):
+        self._request("subscribe", agent=self._scoped(agentName), topic=self._scoped(topic))
+
+    def unsubscribe(self, agentName, topic=BROADCAST):
+        self._request("unsubscribe", agent=self._scoped(agentName), topic=self._scoped(topic))
+
+    def send(self, fromAgent, toAgent, content):
+        if toAgent is None:
+            self.publish(fromAgent, BROADCAST, content)
+            return
+        self._request("send", **{"from": self._scoped(fromAgent), "to": self._scoped(toAgent), "content": encode(content)})
+        if self.onSend:
+            self.onSend(fromAgent, toAgent)
+
+    def publish(self, fromAgent, topic, content):
+        self._request("publish", **{"from": self._scoped(fromAgent), "topic": self._scoped(topic), "content": encode(content)})
+        if self.onSend:
+            self.onSend(fromAgent, None)
+
+    def receive(self, agentName, allowedFrom=None, timeout=0):
+        allowed  = None if allowedFrom is None else [self._scoped(name) for name in allowedFrom]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # The broker blocks until a message arrives, long waits are split so no request outlives the socket timeout
+        while True:
+            wait     = self.timeout / 2 if deadline is None else min(self.timeout / 2, max(0, deadline - time.monotonic()))
+            messages = self._request("receive", agent=self._scoped(agentName), allowedFrom=allowed, timeout=wait)
+            if messages or (deadline is not None and time.monotonic() >= deadline):
+                break
+        return [
+            {"from": self._unscoped(m["from"]), "to": self._unscoped(m["to"]), "content": decode(m["content"])}
+            for m in messages
+        ]
+
+    def pending(self, agentName=None):
+        return self._request("pending", agent=self._scoped(agentName), namespace=self.namespace)
+
+    def stats(self):
+        return self._request("stats")
+
+    def close(self, finished=False):
+        if self.ownsNamespace:
+            try:
+                self._request("dropNamespace", namespace=self.namespace)
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Could not drop namespace {self.namespace} on the broker: {e}")
+        with self._lock:
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local = threading.local()
+
+
+def connectBus(namespace=None):
+    """
+    Return the bus for a new run: a SocketBus when BUS_ADDRESS points at a broker, otherwise an in-process MessageBus.
+    """
+    if os.getenv('BUS_ADDRESS'):
+        return SocketBus(namespace=namespace)
+    return MessageBus()
+
+
+def workerNamespace():
+    return os.getenv('BUS_WORKER_NAMESPACE', 'workers')
+
+
+def remoteWorkers():
+    """
+    Return the namespaced names of the workers listed in BUS_WORKERS, or an empty list when steps run in this process.
+    """
+    if not os.getenv('BUS_ADDRESS'):
+        return []
+    names = [name.strip() for name in os.getenv('BUS_WORKERS', '').split(",") if name.strip()]
+    return [f"{workerNamespace()}/{name}" for name in names]
+
+
+def runTask(agentName, bus, payload):
+    """
+    Run the task of a TASK payload with a sub-agent and return the DONE payload.
+    The dependency results that came with the task are put on the sub-agent's blackboard, so it
+    reads them like it would in the orchestrator's process. A step that raises is answered as failed.
+    """
+    from Agents.Advanced import SubAgent
+
+    task = payload.get("task")
+    try:
+        agent = SubAgent(task, agentName, bus)
+        dependencies = payload.get("dependencies") or {}
+        for name, entry in dependencies.items():
+            agent.blackboard.publish(name, entry)
+        agent.dependencies = list(dependencies)
+        agent.runStep()
+        return {"task": task, "result": agent.result, "failed": not agent.completed}
+    except Exception as e:
+        logger.error(f"Worker {agentName} failed on {task}:", exc_info=True)
+        return {"task": task, "result": f"Step failed: {e}", "failed": True}
+
+
+def runWorker(agentName, address=None, namespace=None):
+    """
+    Serve one worker from this process. Blocks on the broker until a TASK arrives for agentName in
+    the workers namespace, runs it and replies to the sender with DONE and the result.
+    Start one with: python -m Utils.SocketBus [address] --worker <agentName>
+    """
+    bus = SocketBus(address, namespace or workerNamespace(), ownsNamespace=False)
+
+    # Replies go to the namespaced sender the broker reported, the message's sender is only the run's name for it
+    def onTask(sender, message):
+        bus.send(agentName, sender, message.reply(agentName, DONE, runTask(agentName, bus, message.payload)))
+
+    handlers = {TASK: onTask}
+    bus.subscribe(agentName)
+    logger.info(f"Worker {bus.namespace}/{agentName} waiting for tasks on {bus.address}.")
+    try:
+        while True:
+            for message in bus.receive(agentName, timeout=None):
+                content = message["content"]
+                handler = handlers.get(getattr(content, 'kind', None))
+                if handler is None:
+                    logger.warning(f"Worker {agentName} ignored a message from {message['from']}: {content}")
+                    continue
+                handler(message["from"], content)
+    finally:
+        bus.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run the agent bus broker, or a worker serving steps of runs that use it.")
+    parser.add_argument("address", nargs="?", help="unix:/path/to.sock or tcp://host:port, defaults to BUS_ADDRESS")
+    parser.add_argument("--worker", metavar="NAME", help="serve the worker NAME instead of running the broker")
+    parser.add_argument("--namespace", help="namespace of the worker, defaults to BUS_WORKER_NAMESPACE")
+    args = parser.parse_args()
+    if args.worker:
+        runWorker(args.worker, args.address, args.namespace)
+    else:
+        BusBroker(args.address).serveForever()
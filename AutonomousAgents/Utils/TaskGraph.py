@@ -0,0 +1,262 @@
+import re
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+logger = logging.getLogger(__name__)
+
+
+class TaskGraph:
+    """
+    Dependency graph for a decomposed plan.
+    A step can use the output of an earlier step by writing {step N} in its text, where N is the
+    1-based position of that step in the plan. References to the step itself or to later steps are
+    ignored, so the graph is always acyclic.
+    """
+    REFERENCE = re.compile(r"\{\s*step\s*(\d+)\s*\}", re.IGNORECASE)
+
+    def __init__(self, steps):
+        self.steps        = list(steps)
+        self.dependencies = [self._findDependencies(i, step) for i, step in enumerate(self.steps)]
+        self.dependents   = [[] for _ in self.steps]
+        for i, deps in enumerate(self.dependencies):
+            for dep in deps:
+                self.dependents[dep].append(i)
+
+    def _findDependencies(self, index, step):
+        deps = set()
+        for match in self.REFERENCE.finditer(str(step)):
+            dep = int(match.group(1)) - 1
+            if 0 <= dep < index:
+                deps.add(dep)
+        return sorted(deps)
+
+    def hasDependencies(self):
+        """
+        Check if any step references the output of another step.
+        """
+        return any(self.dependencies)
+
+    def resolve(self, index, outputs):
+        """
+        Return the step text with every valid {step N} reference replaced by that step's output.
+        """
+        def replace(match):
+            dep = int(match.group(1)) - 1
+            if dep in self.dependencies[index]:
+                return str(outputs[dep])
+            return match.group(0)
+        return self.REFERENCE.sub(replace, str(self.steps[index]))
+
+    def run(self, executeFn, maxWorkers=1):
+        """
+        Execute the plan with executeFn(index, task) and return one result dict per step, in plan order.
+        Every step whose inputs are ready runs at once (up to maxWorkers), and dependents start as soon
+        as their last input resolves. Steps depending on a failed step are skipped.
+        """
+        outputs = [None] * len(self.steps)
+        results = [None] * len(self.steps)
+        if maxWorkers <= 1:
+            for i in range(len(self.steps)):
+                self._runNode(i, executeFn, outputs, results)
+            return results
+
+        waiting = [len(deps) for deps in self.dependencies]
+        with ThreadPoolExecutor(max_workers=maxWorkers) as pool:
+            pending = {
+                pool.submit(self._runNode, i, executeFn, outputs, results): i
+                for i, count in enumerate(waiting) if count == 0
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    for dependent in self.dependents[index]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            pending[pool.submit(self._runNode, dependent, executeFn, outputs, results)] = dependent
+        return results
+
+    async def arun(self, executeFn, maxWorkers=1):
+        """
+        Async version of run, executeFn must be a coroutine function taking (index, task).
+        """
+        outputs = [None] * len(self.steps)
+        results = [None] * len(self.steps)
+        limit   = asyncio.Semaphore(max(1, maxWorkers))
+        nodes   = []
+
+        async def node(index):
+            if self.dependencies[index]:
+                await asyncio.gather(*(nodes[dep] for dep in self.dependencies[index]))
+            failed = self._failedDependency(index, results)
+            if failed is not None:
+                results[index] = self._skipped(index, failed)
+                return
+            task = self.resolve(index, outputs)
+            async with limit:
+                try:
+                    outputs[index] = await executeFn(index, task)
+                    results[index] = {"step": task, "result": outputs[index]}
+                except Exception as e:
+                    logger.error(f"Plan step {index + 1} failed:", exc_info=True)
+                    results[index] = self._failed(task, e)
+
+        for i in range(len(self.steps)):
+            nodes.append(asyncio.ensure_future(node(i)))
+        await asyncio.gather(*nodes)
+        return results
+
+    def _runNode(self, index, executeFn, outputs, results):
+        failed = self._failedDependency(index, results)
+        if failed is not None:
+            results[index] = self._skipped(index, failed)
+            return
+        task = self.resolve(index, outputs)
+        try:
+            outputs[index] = executeFn(index, task)
+            results[index] = {"step": task, "result": outputs[index]}
+        except Exception as e:
+            logger.error(f"Plan step {index + 1} failed:", exc_info=True)
+            results[index] = self._failed(task, e)
+
+    def _failedDependency(self, index, results):
+        for dep in self.dependencies[index]:
+            if results[dep] is None or "error" in results[dep]:
+                return dep
+        return None
+
+    def _failed(self, task, error):
+        return {"step": task, "result": f"Step failed: {error}", "error": str(error)}
+
+    def _skipped(self, index, failed):
+        return self._failed(self.steps[index], f"depends on failed step {failed + 1}")
+
+
+def buildFusedPrompt(actions, userGoal, stepReferences=True):
+    """
+    Build the prompt that clarifies a goal and plans it in one call, answered by a JSON object
+    with a task and its steps. With stepReferences the steps may use {step N} to pass results on.
+    """
+    references = (
+        "If a call needs the result of an earlier call, write {step N} in its place, where N is the position of that earlier call in your list. "
+        if stepReferences else ""
+    )
+    return (
+        "Given the following available actions:\n"
+        f"{', '.join(actions)}\n"
+        "First restate the user goal below as a single clear task. "
+        "Then break that task down into the MINIMUM number of direct function calls, each matching exactly one of the available actions. "
+        "If an action can't be matched directly, SKIP that step. "
+        "Do NOT include high-level or abstract instructions. "
+        f"{references}"
+        "If the goal can be answered directly without calling any of these actions, use an empty list of steps.\n"
+        "Only respond with a JSON object, no markdown, no explanation, e.g.:\n"
+        '{"task": "Get the current temperature in Spokane", "steps": ["get_temperature(47.6588, -117.4260)"]}\n'
+        f"User Goal: {userGoal}"
+    )
+
+
+def parseFusedPlan(answer, planCache, agentKey):
+    """
+    Parse an answer to buildFusedPrompt into (task, steps) and cache the steps for the clarified
+    task under agentKey. Returns None if the answer is not a task with a list of steps.
+    """
+    match = re.search(r"\{.*\}", answer or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        fused = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(fused, dict) or not isinstance(fused.get("task"), str) or not isinstance(fused.get("steps"), list):
+        return None
+    steps = [str(step).strip() for step in fused["steps"] if str(step).strip()]
+    planCache.set(fused["task"], steps, agentKey)
+    return fused["task"], steps
+
+
+def buildDependencyPrompt(tasks):
+    """
+    Build a single prompt asking for the full dependency matrix of a set of agents.
+    tasks maps each agent name to a printable description of its task.
+    """
+    taskLines = "\n".join(f"{name}: {task}" for name, task in tasks.items())
+    return (
+        "Here are the tasks of a team of agents:\n"
+        f"{taskLines}\n\n"
+        "For EVERY agent, list the NAMES of the other agents whose result it needs before completing its own task. "
+        "Only respond with a JSON object mapping each agent name to a list of agent names, use an empty list if none. "
+        "No markdown, no explanation."
+    )
+
+
+def parseDependencyMatrix(answer, names):
+    """
+    Parse and validate a dependency matrix returned for buildDependencyPrompt.
+    Unknown names and self references are dropped. Returns None if the answer is not a JSON object.
+    """
+    match = re.search(r"\{.*\}", answer or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        matrix = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(matrix, dict):
+        return None
+    known = set(names)
+    dependencies = {}
+    for name in names:
+        needed = matrix.get(name) or []
+        if isinstance(needed, str):
+            needed = [n.strip() for n in needed.split(",")]
+        if not isinstance(needed, list):
+            needed = []
+        dependencies[name] = list(dict.fromkeys(
+            n for n in needed if isinstance(n, str) and n in known and n != name
+        ))
+    return dependencies
+
+
+def askDependencies(tasks, ask):
+    """
+    Ask for the whole dependency matrix in one call instead of one prompt per agent.
+    tasks maps each agent name to a printable description of its task, ask(prompt) returns the
+    model's answer. Returns the parsed matrix, or None for a single agent or an unparseable answer.
+    """
+    if len(tasks) <= 1:
+        return None
+    return parseDependencyMatrix(ask(buildDependencyPrompt(tasks)), list(tasks))
+
+
+async def aaskDependencies(tasks, ask):
+    """
+    Async version of askDependencies, ask must be a coroutine function taking the prompt.
+    """
+    if len(tasks) <= 1:
+        return None
+    return parseDependencyMatrix(await ask(buildDependencyPrompt(tasks)), list(tasks))
+
+
+def dependencyLevels(dependencies):
+    """
+    Group agents into levels that run one after another, each agent in a later level than every
+    agent it depends on. dependencies maps each agent name to the names it needs. Agents left on a
+    dependency cycle share the last level and their dependencies on each other are removed from
+    dependencies, so nobody waits on a result that can't come first. Returns a list of name lists.
+    """
+    remaining = {name: set(needed) & dependencies.keys() for name, needed in dependencies.items()}
+    levels    = []
+    while remaining:
+        ready = [name for name, needed in remaining.items() if not needed & remaining.keys()]
+        if not ready:
+            logger.warning(f"Dependency cycle between {', '.join(remaining)}, running them without each other's results.")
+            for name in remaining:
+                dependencies[name] = [n for n in dependencies[name] if n not in remaining]
+            ready = list(remaining)
+        levels.append(ready)
+        for name in ready:
+            del remaining[name]
+    return levels
@@ -0,0 +1,133 @@
+import os
+import json
+import hashlib
+import inspect
+import threading
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+# Kept in the user's cache directory, not in the package source tree
+DEFAULT_PATH     = Path(os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache') / 'AutonomousAgents' / 'toolManifest.json'
+
+
+class ToolManifest:
+    """
+    Serialized tool schemas keyed by the hash of the file each tool is defined in.
+    The first start introspects every tool and writes the manifest, later starts read schemas
+    straight from it. Editing a tool file changes its hash, so only that file's tools are rebuilt.
+    """
+    def __init__(self, path=None, enabled=None):
+        self.path       = Path(path or os.getenv('TOOL_MANIFEST_PATH') or DEFAULT_PATH)
+        self.enabled    = os.getenv('TOOL_MANIFEST', 'True') == 'True' if enabled is None else enabled
+        self.entries    = {}
+        self.hits       = 0
+        self.misses     = 0
+        self._dirty     = False
+        self._fileCache = {}
+        self._lock      = threading.Lock()
+        if self.enabled:
+            self.load()
+
+    def load(self):
+        """
+        Read the manifest from disk. A missing or unreadable manifest starts empty.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.warning(f"Could not read tool manifest at {self.path}, rebuilding it.")
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.entries = data.get("tools", {})
+
+    def save(self):
+        """
+        Write the manifest to disk if anything was compiled since the last save.
+        The file is written aside and renamed into place so a crash never leaves half a manifest.
+        """
+        with self._lock:
+            if not self.enabled or not self._dirty:
+                return
+            data = {"version": MANIFEST_VERSION, "tools": self.entries}
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, default=str)
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.warning(f"Could not write tool manifest at {self.path}:", exc_info=True)
+
+    def sourceHash(self, func):
+        """
+        Return the hash of the file func is defined in, or None if it has no source file.
+        """
+        try:
+            path = getattr(func, 'sourcePath', None) or inspect.getsourcefile(func)
+        except TypeError:
+            return None
+        if not path:
+            return None
+        with self._lock:
+            if path in self._fileCache:
+                return self._fileCache[path]
+        try:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            digest = None
+        with self._lock:
+            return self._fileCache.setdefault(path, digest)
+
+    def invalidate(self):
+        """
+        Forget the file hashes computed so far, so the next lookup rereads the tool files.
+        """
+        with self._lock:
+            self._fileCache.clear()
+
+    def schema(self, func, kind, build):
+        """
+        Return the schema of the given kind for func, compiling it with build(func) on a miss.
+        kind is a json schema type like 'responses', or 'typed'.
+        """
+        name   = getattr(func, '__name__', str(func))
+        source = self.sourceHash(func) if self.enabled else None
+        if source is None:
+            return build(func)
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry and entry.get("source") == source and kind in entry.get("schemas", {}):
+                self.hits += 1
+                return entry["schemas"][kind]
+        schema = self._serializable(build(func))
+        with self._lock:
+            self.misses += 1
+            entry = self.entries.get(name)
+            if not entry or entry.get("source") != source:
+                entry = self.entries[name] = {"source": source, "schemas": {}}
+            entry["schemas"][kind] = schema
+            self._dirty = True
+        return schema
+
+    def _serializable(self, schema):
+        if hasattr(schema, 'model_dump'):
+            return schema.model_dump(mode='json', exclude_none=True)
+        return schema
+
+    def stats(self):
+        """
+        Return how many schemas were read from the manifest and how many were compiled.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "tools": len(self.entries)}
@@ -0,0 +1,144 @@
+import re
+import time
+import random
+import string
+import difflib
+import threading
+from collections import defaultdict, OrderedDict
+
+
+class ToolResolver:
+    """
+    Index backed resolution of model emitted tool names.
+    Exact names and normalized names (case, spaces, dashes and underscores ignored) are dictionary hits.
+    Anything else is matched through a trigram index, so only names sharing trigrams with the query
+    are scored instead of the whole catalog. Resolutions are memoized in an LRU of memoSize entries,
+    so a stream of distinct misspellings can't grow it without bound.
+    """
+    CANDIDATES = 8
+
+    def __init__(self, names=(), memoSize=1024):
+        self.memoSize = memoSize
+        self._lock    = threading.Lock()
+        self.build(names)
+
+    def build(self, names):
+        """
+        (Re)build the index for the given tool names.
+        """
+        names = list(dict.fromkeys(names))
+        index = defaultdict(set)
+        for name in names:
+            for gram in self.trigrams(self.normalize(name)):
+                index[gram].add(name)
+        with self._lock:
+            self.names      = names
+            self.exact      = set(names)
+            self.normalized = {self.normalize(name): name for name in names}
+            self.index      = dict(index)
+            self.memo       = OrderedDict()
+
+    @staticmethod
+    def normalize(name):
+        return re.sub(r"[\s_\-]+", "", str(name)).lower()
+
+    @staticmethod
+    def trigrams(text):
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @staticmethod
+    def score(a, b):
+        return difflib.SequenceMatcher(None, a, b).ratio() * 100
+
+    def resolve(self, name, threshold=80):
+        """
+        Return the catalog name that best matches name, or None if nothing scores at least threshold.
+        """
+        if name in self.exact:
+            return name
+        key = (name, threshold)
+        with self._lock:
+            memo = self.memo
+            if key in memo:
+                memo.move_to_end(key)
+                return memo[key]
+        normalized = self.normalize(name)
+        match = self.normalized.get(normalized)
+        if match is None:
+            match = self._search(normalized, threshold)
+        with self._lock:
+            # A rebuild swaps in a fresh memo, so results computed against the old index are dropped
+            if memo is self.memo:
+                memo[key] = match
+                while len(memo) > self.memoSize:
+                    memo.popitem(last=False)
+        return match
+
+    def _search(self, normalized, threshold):
+        counts = defaultdict(int)
+        for gram in self.trigrams(normalized):
+            for name in self.index.get(gram, ()):
+                counts[name] += 1
+        candidates = sorted(counts, key=counts.get, reverse=True)[:self.CANDIDATES]
+        best, bestScore = None, threshold
+        for candidate in candidates:
+            score = self.score(normalized, self.normalize(candidate))
+            if score >= bestScore:
+                best, bestScore = candidate, score
+        return best
+
+    def linearResolve(self, name, threshold=80):
+        """
+        Reference matcher that scores name against every tool in the catalog.
+        """
+        if name in self.exact:
+            return name
+        normalized = self.normalize(name)
+        best, bestScore = None, threshold
+        for candidate in self.names:
+            score = self.score(normalized, self.normalize(candidate))
+            if score >= bestScore:
+                best, bestScore = candidate, score
+        return best
+
+
+def benchmark(sizes=(10, 100, 1000), queries=200, threshold=80, seed=0):
+    """
+    Compare the indexed resolver with a linear scan over synthetic catalogs of the given sizes.
+    Queries are catalog names with one character changed. The memo is cleared before the indexed
+    run, so the numbers show the cold cost of a lookup, not memo hits.
+    Returns one dict per size with microseconds per lookup and how often both matchers agreed.
+    """
+    rng     = random.Random(seed)
+    results = []
+    for size in sizes:
+        names    = [f"{rng.choice(['get', 'set', 'run', 'find'])}_{''.join(rng.choices(string.ascii_lowercase, k=8))}_{i}" for i in range(size)]
+        resolver = ToolResolver(names)
+        asked    = []
+        for _ in range(queries):
+            name  = rng.choice(names)
+            pos   = rng.randrange(len(name))
+            asked.append(name[:pos] + rng.choice(string.ascii_lowercase) + name[pos + 1:])
+
+        start  = time.perf_counter()
+        linear = [resolver.linearResolve(q, threshold) for q in asked]
+        linearTime = time.perf_counter() - start
+
+        resolver.build(names)
+        start   = time.perf_counter()
+        indexed = [resolver.resolve(q, threshold) for q in asked]
+        indexedTime = time.perf_counter() - start
+
+        results.append({
+            "tools":     size,
+            "linearUs":  linearTime / queries * 1e6,
+            "indexedUs": indexedTime / queries * 1e6,
+            "agreement": sum(a == b for a, b in zip(linear, indexed)) / queries,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    for row in benchmark():
+        print(f"{row['tools']:>6} tools  linear {row['linearUs']:>9.1f}us  indexed {row['indexedUs']:>7.1f}us  agreement {row['agreement']:.0%}")
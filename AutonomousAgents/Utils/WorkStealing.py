@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class WorkStealingScheduler:
+    """
+    Work-stealing scheduler for agent tasks.
+    Every worker owns a deque and takes work from its head. A worker whose deque is empty steals from
+    the tail of the deepest peer deque, so idle workers pull queued work and busy workers are never
+    handed more. Nothing moves between workers unless a worker is idle and a peer still has a backlog.
+    """
+    def __init__(self, workers):
+        self.workers     = list(workers)
+        self.queues      = {name: deque() for name in self.workers}
+        self.stealCounts = {name: 0 for name in self.workers}
+        self.executed    = {name: 0 for name in self.workers}
+        self._lock       = threading.Lock()
+
+    def push(self, worker, item):
+        """
+        Queue an item on a worker's deque.
+        """
+        with self._lock:
+            self.queues[worker].append(item)
+
+    def distribute(self, items):
+        """
+        Spread items across the workers round-robin.
+        """
+        for i, item in enumerate(items):
+            self.push(self.workers[i % len(self.workers)], item)
+
+    def queueDepth(self):
+        """
+        Return the number of queued items per worker.
+        """
+        with self._lock:
+            return {name: len(queue) for name, queue in self.queues.items()}
+
+    def stats(self):
+        """
+        Return queue depth, executed and stolen counts per worker.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "queued":   len(self.queues[name]),
+                    "executed": self.executed[name],
+                    "steals":   self.stealCounts[name],
+                }
+                for name in self.workers
+            }
+
+    def _next(self, worker):
+        with self._lock:
+            own = self.queues[worker]
+            if own:
+                item = own.popleft()
+            else:
+                victim = max(self.queues, key=lambda name: len(self.queues[name]))
+                if not self.queues[victim]:
+                    return None
+                item = self.queues[victim].pop()
+                self.stealCounts[worker] += 1
+            self.executed[worker] += 1
+            return item
+
+    def run(self, fn):
+        """
+        Run fn(item, worker) for every queued item, one thread per worker, until all deques are empty.
+        """
+        def work(worker):
+            item = self._next(worker)
+            while item is not None:
+                try:
+                    fn(item, worker)
+                except Exception:
+                    logger.error(f"Worker {worker} failed to run a task:", exc_info=True)
+                item = self._next(worker)
+
+        threads = [
+            threading.Thread(target=work, args=(worker,), name=f"Worker-{worker}", daemon=True)
+            for worker in self.workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    async def arun(self, fn):
+        """
+        Async version of run, fn must be a coroutine function taking (item, worker).
+        """
+        async def work(worker):
+            item = self._next(worker)
+            while item is not None:
+                try:
+                    await fn(item, worker)
+                except Exception:
+                    logger.error(f"Worker {worker} failed to run a task:", exc_info=True)
+                item = self._next(worker)
+
+        await asyncio.gather(*(work(worker) for worker in self.workers))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules import each other as Utils.X and Agents.X, relative to the AutonomousAgents directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
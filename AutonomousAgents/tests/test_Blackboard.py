@@ -0,0 +1,25 @@
+import threading
+from Utils.Blackboard import Blackboard
+
+
+def test_waitReturnsOnceEveryKeyIsPublished():
+    board = Blackboard(timeout=5)
+    threading.Timer(0.05, board.publish, ("a", 1)).start()
+    threading.Timer(0.1, board.publish, ("b", 2)).start()
+    assert board.wait(["a", "b"]) == {"a": 1, "b": 2}
+
+
+def test_waitLeavesOutKeysMissingAtTheTimeout():
+    board = Blackboard()
+    board.publish("a", 1)
+    assert board.wait(["a", "missing"], timeout=0.05) == {"a": 1}
+
+
+def test_publishBumpsVersionsAndNotifiesSubscribers():
+    board, seen = Blackboard(), []
+    board.subscribe(lambda key, value, version: seen.append((key, value, version)))
+    board.publish("a", 1)
+    board.publish("a", 2)
+    assert board.entry("a") == (2, 2)
+    assert board.future("a").result() == 1
+    assert seen == [("a", 1, 1), ("a", 2, 2)]
@@ -0,0 +1,63 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("urllib3")
+
+from Utils.HttpClient import HttpClient
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = 0
+
+    def do_GET(self):
+        if type(self).failures:
+            type(self).failures -= 1
+            self.reply(503, b'{}')
+        else:
+            self.reply(200, b'{"ok": true}')
+
+    def reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd  = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("HTTP_BACKOFF", "0")
+    monkeypatch.setattr(HttpClient, "_instance", None)
+    return HttpClient()
+
+
+def test_retriesServerErrors(server, client):
+    FlakyHandler.failures = 2
+    assert client.getJson(server) == {"ok": True}
+    assert client.stats()["retries"] == 2
+
+
+def test_reusesPooledConnections(server, client):
+    FlakyHandler.failures = 0
+    for _ in range(5):
+        client.getJson(server)
+    stats = client.stats()
+    assert stats["requests"] == 5
+    assert stats["connections"] == 1
+    assert stats["reuseRate"] == pytest.approx(0.8)
@@ -0,0 +1,47 @@
+import threading
+import time
+from Utils.MessageBus import MessageBus
+
+
+def test_receiveKeepsSendOrderAcrossSenders():
+    bus = MessageBus()
+    bus.subscribe("a")
+    bus.send("x", "a", 1)
+    bus.send("y", "a", 2)
+    bus.send("x", "a", 3)
+    assert [m["content"] for m in bus.receive("a")] == [1, 2, 3]
+    assert bus.pending("a") == 0
+
+
+def test_allowedFromLeavesOtherSendersQueued():
+    bus = MessageBus()
+    bus.send("x", "a", 1)
+    bus.send("y", "a", 2)
+    assert [m["content"] for m in bus.receive("a", allowedFrom=["y"])] == [2]
+    assert [m["content"] for m in bus.receive("a")] == [1]
+
+
+def test_broadcastSkipsTheSender():
+    bus = MessageBus()
+    for name in ("a", "b", "c"):
+        bus.subscribe(name)
+    bus.send("a", None, "hi")
+    assert bus.pending("a") == 0
+    assert bus.pending("b") == bus.pending("c") == 1
+
+
+def test_dropOldestIsTheDefaultPolicy():
+    bus = MessageBus(maxQueue=2)
+    for value in range(3):
+        bus.send("x", "a", value)
+    assert [m["content"] for m in bus.receive("a")] == [1, 2]
+    assert bus.stats()["dropped"] == 1
+
+
+def test_receiveWithTimeoutWakesOnArrival():
+    bus = MessageBus()
+    threading.Timer(0.05, bus.send, ("x", "a", 1)).start()
+    start = time.monotonic()
+    assert [m["content"] for m in bus.receive("a", timeout=5)] == [1]
+    assert time.monotonic() - start < 1
+    assert bus.receive("a", timeout=0.05) == []
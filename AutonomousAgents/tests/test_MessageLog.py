@@ -0,0 +1,55 @@
+from Utils.MessageLog import SegmentLog, DurableMessageBus, openRunBus, replay
+from Utils.Messages import Message, DONE
+
+
+def test_segmentLogRollsAndReadsBackInOrder(tmp_path):
+    log = SegmentLog(str(tmp_path / "log"), segmentSize=256)
+    offsets = [log.append({"n": n, "pad": "x" * 40}) for n in range(20)]
+    assert offsets == list(range(20))
+    assert len(log.segments) > 1
+    assert [record["n"] for _, record in log.read(15)] == [15, 16, 17, 18, 19]
+    log.close()
+
+    reopened = SegmentLog(str(tmp_path / "log"), segmentSize=256)
+    assert reopened.nextOffset == 20
+    assert reopened.append({"n": 20}) == 20
+    reopened.close()
+
+
+def test_segmentLogKeepsCommittedOffsets(tmp_path):
+    log = SegmentLog(str(tmp_path / "log"))
+    for n in range(3):
+        log.append({"n": n})
+    log.commit("agent", 1)
+    log.commit("agent", 0)
+    log.close()
+    assert SegmentLog(str(tmp_path / "log")).committed("agent") == 2
+
+
+def test_durableBusRestoresHistoryAfterACrash(tmp_path):
+    directory = str(tmp_path / "run")
+    bus = DurableMessageBus(directory)
+    bus.send("a", "b", Message(DONE, "a", "b", {"result": 1}))
+    bus.send("a", "c", "plain")
+    bus.receive("b")
+    bus.log.close()
+
+    history = DurableMessageBus(directory).history()
+    assert [entry["to"] for entry in history] == ["b", "c"]
+    assert history[0]["content"].payload == {"result": 1}
+    assert history[0]["handledBy"] == ["b"]
+    assert history[1]["handledBy"] == []
+
+
+def test_finishedRunsAreArchivedForReplay(tmp_path):
+    directory = str(tmp_path / "run")
+    bus = openRunBus(directory)
+    bus.send("a", "b", "hello")
+    bus.close(finished=True)
+
+    fresh = openRunBus(directory)
+    assert fresh.history() == []
+    fresh.close()
+    archives = [path for path in tmp_path.iterdir() if path.name.startswith("run.") and path.is_dir()]
+    assert len(archives) == 1
+    assert [entry["content"] for entry in replay(str(archives[0]))] == ["hello"]
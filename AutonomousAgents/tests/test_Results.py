@@ -0,0 +1,19 @@
+from Utils.Results import notReady
+from Utils.ResultFormatter import ResultFormatter
+
+
+def test_notReadyChecksEveryLine():
+    assert notReady("Current temperature: 20C\nCould not fetch humidity")
+    assert notReady("Step failed.")
+    assert not notReady("Current temperature: 20C\nCurrent humidity: 40%")
+
+
+def test_formatterOnlySkipsTheSummaryForRecognizedResults():
+    formatter = ResultFormatter()
+    formatter.enabled = True
+    assert formatter.format([{"step": "direct_answer", "result": "Hi there"}]) == "Hi there"
+    assert formatter.format([{"step": "getTime()", "result": "9:30"}]) == "It's 9:30."
+    assert formatter.format([{"step": "getWeather()", "result": "Current humidity: 40%"}]) == "Current humidity: 40%"
+    assert formatter.format([{"step": "getWeather()", "result": "42"}]) is None
+    assert formatter.format([{"step": "getWeather()", "result": "Current humidity: 40%\nError: no wind"}]) is None
+    assert formatter.format([{"step": "a", "result": "Opened Spotify"}, {"step": "b", "result": "Opened Slack"}]) is None
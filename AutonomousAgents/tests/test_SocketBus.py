@@ -0,0 +1,54 @@
+import socket
+import struct
+import pytest
+from Utils.SocketBus import sendFrame, recvFrame, parseAddress, BusBroker, SocketBus, MAX_FRAME
+from Utils.Messages import Message, TASK
+
+
+def test_framesRoundTripOverASocketPair():
+    left, right = socket.socketpair()
+    with left, right:
+        sendFrame(left, {"op": "send", "content": "x" * 100000})
+        sendFrame(left, {"op": "stats"})
+        assert recvFrame(right) == {"op": "send", "content": "x" * 100000}
+        assert recvFrame(right) == {"op": "stats"}
+        left.close()
+        assert recvFrame(right) is None
+
+
+def test_oversizedFramesAreRejected():
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(struct.pack(">I", MAX_FRAME + 1))
+        with pytest.raises(ValueError):
+            recvFrame(right)
+
+
+def test_parseAddress():
+    assert parseAddress("unix:/tmp/agents.sock") == (socket.AF_UNIX, "/tmp/agents.sock")
+    assert parseAddress("tcp://10.0.0.1:7878") == (socket.AF_INET, ("10.0.0.1", 7878))
+    assert parseAddress(":7878") == (socket.AF_INET, ("127.0.0.1", 7878))
+
+
+def test_clientsShareMailboxesThroughTheBroker(tmp_path):
+    address = f"unix:{tmp_path / 'bus.sock'}"
+    broker  = BusBroker(address).start()
+    run     = SocketBus(address, "run")
+    worker  = SocketBus(address, "workers", ownsNamespace=False)
+    try:
+        run.subscribe("Kevin")
+        worker.subscribe("W1")
+        run.send("Kevin", "workers/W1", Message(TASK, "Kevin", "W1", {"task": "get weather"}))
+        [message] = worker.receive("W1", timeout=5)
+        assert message["from"] == "run/Kevin"
+        assert message["content"].payload == {"task": "get weather"}
+
+        worker.send("W1", message["from"], message["content"].reply("W1", "done", {"result": 1}))
+        [reply] = run.receive("Kevin", ["workers/W1"], timeout=5)
+        assert reply["content"].correlationId == message["content"].correlationId
+        assert run.pending() == 0
+    finally:
+        run.close()
+        worker.close()
+        broker.stop()
+    assert not any(name.startswith("run/") for name in broker.bus.mailboxes)
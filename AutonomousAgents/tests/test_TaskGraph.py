@@ -0,0 +1,68 @@
+import json
+from Utils.TaskGraph import TaskGraph, parseDependencyMatrix, dependencyLevels, parseFusedPlan, askDependencies
+
+
+class FakePlanCache:
+    def __init__(self):
+        self.stored = []
+
+    def set(self, goal, steps, agentKey):
+        self.stored.append((goal, steps, agentKey))
+
+
+def test_referencesOnlyPointBackwards():
+    graph = TaskGraph(["a()", "b({step 1})", "c({step 3}, {step 2})"])
+    assert graph.dependencies == [[], [0], [1]]
+    assert graph.hasDependencies()
+
+
+def test_runResolvesReferencesAndSkipsDependentsOfFailedSteps():
+    def execute(index, task):
+        if task == "fail()":
+            raise RuntimeError("boom")
+        return f"out{index + 1}"
+
+    results = TaskGraph(["a()", "b({step 1})", "fail()", "c({step 3})"]).run(execute, maxWorkers=4)
+    assert results[1] == {"step": "b(out1)", "result": "out2"}
+    assert "error" in results[2]
+    assert results[3]["error"] == "depends on failed step 3"
+
+
+def test_parseDependencyMatrixDropsUnknownAndSelfReferences():
+    answer = 'Here you go: {"Kevin": [], "Stuart": ["Kevin", "Stuart", "Nobody"], "Bob": "Kevin, Stuart"}'
+    matrix = parseDependencyMatrix(answer, ["Kevin", "Stuart", "Bob"])
+    assert matrix == {"Kevin": [], "Stuart": ["Kevin"], "Bob": ["Kevin", "Stuart"]}
+    assert parseDependencyMatrix("no json here", ["Kevin"]) is None
+
+
+def test_dependencyLevelsOrderAgentsAfterWhatTheyNeed():
+    levels = dependencyLevels({"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]})
+    assert [sorted(level) for level in levels] == [["a"], ["b", "c"], ["d"]]
+
+
+def test_dependencyLevelsBreakCycles():
+    dependencies = {"a": [], "b": ["c"], "c": ["b"]}
+    levels = dependencyLevels(dependencies)
+    assert levels[0] == ["a"]
+    assert sorted(levels[1]) == ["b", "c"]
+    assert dependencies["b"] == [] and dependencies["c"] == []
+
+
+def test_askDependenciesSkipsTheCallForOneAgent():
+    prompts = []
+
+    def ask(prompt):
+        prompts.append(prompt)
+        return json.dumps({"a": [], "b": ["a"]})
+
+    assert askDependencies({"a": "x"}, ask) is None
+    assert askDependencies({"a": "x", "b": "y"}, ask) == {"a": [], "b": ["a"]}
+    assert len(prompts) == 1
+
+
+def test_parseFusedPlanCachesTheClarifiedTask():
+    cache = FakePlanCache()
+    fused = parseFusedPlan('```json\n{"task": "Get the weather", "steps": ["getWeather()", " "]}\n```', cache, "Basic")
+    assert fused == ("Get the weather", ["getWeather()"])
+    assert cache.stored == [("Get the weather", ["getWeather()"], "Basic")]
+    assert parseFusedPlan('{"steps": []}', cache, "Basic") is None
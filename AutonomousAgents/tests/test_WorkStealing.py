@@ -0,0 +1,51 @@
+import asyncio
+import threading
+import time
+from Utils.WorkStealing import WorkStealingScheduler
+
+
+def test_idleWorkersStealFromTheDeepestQueue():
+    scheduler = WorkStealingScheduler(["slow", "fast"])
+    for item in range(6):
+        scheduler.push("slow", item)
+    done, lock = [], threading.Lock()
+
+    def run(item, worker):
+        if worker == "slow":
+            time.sleep(0.05)
+        with lock:
+            done.append(item)
+
+    scheduler.run(run)
+    stats = scheduler.stats()
+    assert sorted(done) == list(range(6))
+    assert stats["fast"]["steals"] > 0
+    assert stats["slow"]["executed"] + stats["fast"]["executed"] == 6
+    assert all(entry["queued"] == 0 for entry in stats.values())
+
+
+def test_failingItemsDontStopTheWorker():
+    scheduler = WorkStealingScheduler(["only"])
+    scheduler.distribute([1, 2, 3])
+    done = []
+
+    def run(item, worker):
+        if item == 2:
+            raise RuntimeError("boom")
+        done.append(item)
+
+    scheduler.run(run)
+    assert done == [1, 3]
+
+
+def test_arunCanBeCalledAgainForTheNextLevel():
+    scheduler = WorkStealingScheduler(["a", "b"])
+    done = []
+
+    async def run(item, worker):
+        done.append(item)
+
+    for level in ([1, 2, 3], [4]):
+        scheduler.distribute(level)
+        asyncio.run(scheduler.arun(run))
+    assert sorted(done) == [1, 2, 3, 4]